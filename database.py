@@ -2,14 +2,17 @@
 Database module using SQLAlchemy for ORM with Pydantic model integration.
 """
 import os
+import sys
 import json
 import logging
 from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
 
-from sqlalchemy import create_engine, Column, Integer, String, Text, ForeignKey, Boolean, DateTime
+from sqlalchemy import create_engine, Column, Integer, String, Text, ForeignKey, Boolean, DateTime, Index
+from sqlalchemy import event as sqlalchemy_event, select
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship, Session
+from pydantic import TypeAdapter
 
 # Import our Pydantic models
 from models import CalendarEvent, Project, DateTimeEncoder, CalendarEventTime
@@ -26,6 +29,16 @@ SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+@sqlalchemy_event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL with synchronous=NORMAL: commits append to the log without an fsync each."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
 # Create base class for SQLAlchemy models
 Base = declarative_base()
 
@@ -66,36 +79,45 @@ class EventModel(Base):
     # Relationships
     project = relationship("ProjectModel", back_populates="events")
     
-    def to_pydantic(self) -> CalendarEvent:
-        """Convert SQLAlchemy model to Pydantic model."""
-        # Create start and end time objects
-        start = CalendarEventTime(
-            date_time=self.start_time.isoformat() if self.start_time else None,
-            dt=self.start_time
-        )
-        
-        end = CalendarEventTime(
-            date_time=self.end_time.isoformat() if self.end_time else None,
-            dt=self.end_time
-        )
-        
+    # Serves "WHERE project_id IS NULL ORDER BY start_time DESC" without a scan and sort
+    __table_args__ = (
+        Index("idx_events_unclassified", project_id, start_time.desc()),
+    )
+    
+    def _pydantic_fields(self) -> Dict[str, Any]:
+        """Input for validating this row as a CalendarEvent."""
         # Get project name if available
         project_name = None
         if self.project:
-            project_name = self.project.name
+            project_name = sys.intern(self.project.name)
             
-        # Create the CalendarEvent
-        return CalendarEvent(
-            id=self.event_id,
-            summary=self.summary or "",
-            description=self.description or "",
-            location=self.location,
-            calendar_id=self.calendar_id,
-            start=start,
-            end=end,
-            project_id=self.project_id,
-            project_name=project_name
-        )
+        return {
+            "id": self.event_id,
+            "summary": self.summary or "",
+            "description": self.description or "",
+            "location": self.location,
+            # Few distinct calendars per database: share one string per calendar ID
+            "calendar_id": sys.intern(self.calendar_id) if self.calendar_id else self.calendar_id,
+            "start": {"dt": self.start_time},
+            "end": {"dt": self.end_time},
+            "project_id": self.project_id,
+            "project_name": project_name
+        }
+    
+    def to_pydantic(self) -> CalendarEvent:
+        """Convert SQLAlchemy model to Pydantic model."""
+        return CalendarEvent.model_validate(self._pydantic_fields())
+    
+    @classmethod
+    def to_pydantic_list(cls, rows: List["EventModel"]) -> List[CalendarEvent]:
+        """Convert query results to Pydantic models with a single validation call."""
+        return _EVENT_LIST_ADAPTER.validate_python([row._pydantic_fields() for row in rows])
+
+
+# Validate lists of events and projects in one pydantic-core call each
+# (see EventModel.to_pydantic_list and get_projects)
+_EVENT_LIST_ADAPTER = TypeAdapter(List[CalendarEvent])
+_PROJECT_LIST_ADAPTER = TypeAdapter(List[Project])
 
 
 class ProposedEventModel(Base):
@@ -127,6 +149,9 @@ def init_db(db_path: str = DB_PATH) -> None:
     """Initialize the database and create tables if they don't exist."""
     logger.info(f"Initializing database: {os.path.basename(db_path)}")
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so add indexes missing from older databases
+    for index in EventModel.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
     logger.info(f"Database initialized at {os.path.abspath(db_path)}")
 
 
@@ -144,8 +169,11 @@ def get_projects() -> List[Project]:
     """
     db = get_db_session()
     try:
-        projects = db.query(ProjectModel).order_by(ProjectModel.name).all()
-        return [project.to_pydantic() for project in projects]
+        # Plain column rows, validated in one call: no ORM objects to build
+        rows = db.execute(
+            select(*ProjectModel.__table__.columns).order_by(ProjectModel.name)
+        ).mappings().all()
+        return _PROJECT_LIST_ADAPTER.validate_python(rows)
     finally:
         db.close()
 
@@ -192,7 +220,7 @@ def get_project_by_id(project_id: int) -> Optional[Project]:
     """
     db = get_db_session()
     try:
-        project = db.query(ProjectModel).filter(ProjectModel.id == project_id).first()
+        project = db.get(ProjectModel, project_id)
         if not project:
             return None
         return project.to_pydantic()
@@ -200,6 +228,22 @@ def get_project_by_id(project_id: int) -> Optional[Project]:
         db.close()
 
 
+# Bound parameters per IN (...) query, below SQLite's default limit of 999
+_MAX_SQL_PARAMS = 900
+
+
+def _event_time_column(event_time: CalendarEventTime, column: str) -> Optional[datetime]:
+    """Value for a start_time/end_time column: the parsed datetime, or a parse of its dateTime string."""
+    if event_time.dt:
+        return event_time.dt
+    if event_time.date_time:
+        try:
+            return datetime.fromisoformat(event_time.date_time.replace('Z', '+00:00'))
+        except Exception as e:
+            logger.warning(f"Could not parse {column}: {e}")
+    return None
+
+
 def store_events(events: List[Union[CalendarEvent, Dict[str, Any]]], db_path: str = DB_PATH) -> int:
     """
     Store events in the database.
@@ -217,10 +261,9 @@ def store_events(events: List[Union[CalendarEvent, Dict[str, Any]]], db_path: st
         # Initialize database
         init_db(db_path)
         
-        # Get session
-        db = get_db_session()
-        
-        count = 0
+        # Convert every event to a column dict first, keyed by event ID (a later
+        # copy of the same event wins, as it did when events were stored one by one)
+        rows = {}
         for event in events:
             try:
                 # Convert dict to Pydantic model if needed
@@ -232,76 +275,56 @@ def store_events(events: List[Union[CalendarEvent, Dict[str, Any]]], db_path: st
                         logger.error(f"Error converting dict to CalendarEvent: {e}")
                         continue
                 
-                # Check if event already exists
-                existing = db.query(EventModel).filter(EventModel.event_id == event.id).first()
-                
-                if existing:
-                    # Update existing event
-                    existing.summary = event.summary
-                    existing.description = event.description
-                    existing.location = event.location
-                    existing.calendar_id = event.calendar_id
-                    
-                    # Handle datetime conversion
-                    if event.start.dt:
-                        existing.start_time = event.start.dt
-                    elif event.start.date_time:
-                        try:
-                            existing.start_time = datetime.fromisoformat(event.start.date_time.replace('Z', '+00:00'))
-                        except Exception as e:
-                            logger.warning(f"Could not parse start_time: {e}")
-                            existing.start_time = None
-                    
-                    if event.end.dt:
-                        existing.end_time = event.end.dt
-                    elif event.end.date_time:
-                        try: 
-                            existing.end_time = datetime.fromisoformat(event.end.date_time.replace('Z', '+00:00'))
-                        except Exception as e:
-                            logger.warning(f"Could not parse end_time: {e}")
-                            existing.end_time = None
-                            
-                    db.commit()
-                    logger.debug(f"Updated existing event: {event.id}")
-                else:
-                    # Create new event
-                    start_time = None
-                    if event.start.dt:
-                        start_time = event.start.dt
-                    elif event.start.date_time:
-                        try:
-                            start_time = datetime.fromisoformat(event.start.date_time.replace('Z', '+00:00'))
-                        except Exception as e:
-                            logger.warning(f"Could not parse start_time: {e}")
-                    
-                    end_time = None
-                    if event.end.dt:
-                        end_time = event.end.dt
-                    elif event.end.date_time:
-                        try:
-                            end_time = datetime.fromisoformat(event.end.date_time.replace('Z', '+00:00'))
-                        except Exception as e:
-                            logger.warning(f"Could not parse end_time: {e}")
-                    
-                    new_event = EventModel(
-                        event_id=event.id,
-                        summary=event.summary,
-                        description=event.description,
-                        location=event.location,
-                        calendar_id=event.calendar_id,
-                        start_time=start_time,
-                        end_time=end_time
-                    )
-                    db.add(new_event)
-                    db.commit()
-                    logger.debug(f"Created new event: {event.id}")
-                count += 1
+                row = {
+                    "event_id": event.id,
+                    "summary": event.summary,
+                    "description": event.description,
+                    "location": event.location,
+                    "calendar_id": event.calendar_id
+                }
+                # An event without a time leaves an existing row's time as it is
+                if event.start.dt or event.start.date_time:
+                    row["start_time"] = _event_time_column(event.start, "start_time")
+                if event.end.dt or event.end.date_time:
+                    row["end_time"] = _event_time_column(event.end, "end_time")
+                rows[event.id] = row
             except Exception as e:
                 logger.error(f"Error storing event {getattr(event, 'id', 'unknown')}: {e}")
-                db.rollback()
                 continue
-                
-        db.close()
+        
+        # Find the events that already exist with one query per chunk of IDs
+        # (chunked to stay under SQLite's bound-parameter limit)
+        db = get_db_session()
+        try:
+            event_ids = list(rows)
+            existing_ids = {}
+            for i in range(0, len(event_ids), _MAX_SQL_PARAMS):
+                existing_ids.update(
+                    db.query(EventModel.event_id, EventModel.id)
+                    .filter(EventModel.event_id.in_(event_ids[i:i + _MAX_SQL_PARAMS]))
+                    .all()
+                )
+            
+            new_rows = []
+            updated_rows = []
+            for event_id, row in rows.items():
+                if event_id in existing_ids:
+                    updated_rows.append({"id": existing_ids[event_id], **row})
+                else:
+                    new_rows.append(row)
+            
+            # Write everything in one transaction
+            db.bulk_insert_mappings(EventModel, new_rows)
+            db.bulk_update_mappings(EventModel, updated_rows)
+            db.commit()
+            logger.debug("Created %d and updated %d events", len(new_rows), len(updated_rows))
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        
+        count = len(rows)
         logger.info(f"Successfully stored {count} events")
         return count
     except Exception as e:
@@ -336,11 +359,7 @@ def get_unclassified_events(limit: int = 100, include_past: bool = False) -> Lis
         query = query.limit(limit)
         
         # Convert to Pydantic models
-        events = []
-        for event in query.all():
-            events.append(event.to_pydantic())
-            
-        return events
+        return EventModel.to_pydantic_list(query.all())
     finally:
         db.close()
 
@@ -366,11 +385,7 @@ def get_classified_events(limit: int = 1000) -> List[CalendarEvent]:
         query = query.limit(limit)
         
         # Convert to Pydantic models
-        events = []
-        for event in query.all():
-            events.append(event.to_pydantic())
-            
-        return events
+        return EventModel.to_pydantic_list(query.all())
     finally:
         db.close()
 
@@ -388,8 +403,8 @@ def update_event_project(event_id: int, project_id: int) -> bool:
     """
     db = get_db_session()
     try:
-        # Get the event by its database ID
-        event = db.query(EventModel).filter(EventModel.id == event_id).first()
+        # Get the event by its database ID (a primary-key lookup)
+        event = db.get(EventModel, event_id)
         if not event:
             logger.error(f"Event with ID {event_id} not found")
             return False
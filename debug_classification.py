@@ -40,6 +40,52 @@ except ImportError:
 # Database connection
 DB_PATH = "planner.db"
 
+# Compiled prompt produced offline by optimize_classifier.py
+OPTIMIZED_PROGRAM_PATH = "classify_event.optimized.json"
+
+# Project lists longer than this are sent to the LLM with shortened names
+COMPRESS_PROJECTS_OVER = 10
+SHORT_NAME_LENGTH = 12
+
+# Define the DSPy signature for event classification
+class ClassifyEvent(dspy.Signature):
+    """Classify calendar events into projects based on their title and description."""
+    event_title = dspy.InputField(desc="The title of the calendar event")
+    event_description = dspy.InputField(desc="The description of the calendar event (might be empty)")
+    project_names = dspy.InputField(desc="List of available project names to classify the event into")
+    
+    project_name = dspy.OutputField(desc="The most likely project name for this event, or 'unknown' if it doesn't match any project")
+    confidence = dspy.OutputField(desc="The confidence percentage (0-100) in this classification")
+    explanation = dspy.OutputField(desc="A brief explanation of why this project was chosen")
+
+def _shorten(name, k=SHORT_NAME_LENGTH):
+    """Truncate a project name to its first k characters."""
+    return name if len(name) <= k else name[:k].rstrip()
+
+def compress_project_names(project_names):
+    """
+    Shorten project names for the prompt when the list is long.
+    
+    Names whose prefix is shared with another project are kept in full so every
+    short name still maps back to exactly one project.
+    
+    Returns:
+        Tuple of (names to send to the LLM, mapping of sent name -> full name)
+    """
+    if len(project_names) <= COMPRESS_PROJECTS_OVER:
+        return project_names, {name: name for name in project_names}
+    
+    prefix_counts = {}
+    for name in project_names:
+        prefix = _shorten(name)
+        prefix_counts[prefix] = prefix_counts.get(prefix, 0) + 1
+    
+    short_to_full = {}
+    for name in project_names:
+        prefix = _shorten(name)
+        short_to_full[prefix if prefix_counts[prefix] == 1 else name] = name
+    return list(short_to_full), short_to_full
+
 def fetch_projects_from_db():
     """Get all available projects from the database."""
     conn = sqlite3.connect(DB_PATH)
@@ -96,19 +142,14 @@ def setup_dspy():
     dspy.configure(lm=lm)
     logger.info(f"DSPy configured with OpenAI model: {openai_model}")
     
-    # Define the DSPy signature for event classification
-    class ClassifyEvent(dspy.Signature):
-        """Classify calendar events into projects based on their title and description."""
-        event_title = dspy.InputField(desc="The title of the calendar event")
-        event_description = dspy.InputField(desc="The description of the calendar event (might be empty)")
-        project_names = dspy.InputField(desc="List of available project names to classify the event into")
-        
-        project_name = dspy.OutputField(desc="The most likely project name for this event, or 'unknown' if it doesn't match any project")
-        confidence = dspy.OutputField(desc="The confidence percentage (0-100) in this classification")
-        explanation = dspy.OutputField(desc="A brief explanation of why this project was chosen")
-   
-    # Create a predictor using the signature
-    predictor = dspy.Predict(ClassifyEvent)
+    # Create a predictor using the signature; reasoning first cuts down on
+    # hallucinated project names and the re-runs they cause
+    predictor = dspy.ChainOfThought(ClassifyEvent)
+    
+    # Reuse the MIPROv2-compiled prompt produced by optimize_classifier.py
+    if os.path.exists(OPTIMIZED_PROGRAM_PATH):
+        predictor.load(OPTIMIZED_PROGRAM_PATH)
+        logger.info(f"Loaded optimized classifier from {OPTIMIZED_PROGRAM_PATH}")
     
     return predictor
 
@@ -121,6 +162,7 @@ def run_classification_tests(predictor, projects, events):
         return
     
     logger.info(f"Projects available for classification: {', '.join(project_names)}")
+    short_names, short_to_full = compress_project_names(project_names)
     
     for i, event in enumerate(events):
         event_id, title, description, start_time, end_time, calendar_id = event
@@ -135,8 +177,10 @@ def run_classification_tests(predictor, projects, events):
             result = predictor(
                 event_title=title,
                 event_description=description or "",
-                project_names=project_names
+                project_names=short_names
             )
+            # Map a shortened name back to the full project name
+            result.project_name = short_to_full.get(result.project_name.strip(), result.project_name)
             
             # Log the result
             logger.info(f"Classification result:")
@@ -198,18 +242,6 @@ def manual_classification_test():
         }
     ]
     
-    # Define the DSPy signature for event classification
-    class ClassifyEvent(dspy.Signature):
-        """Classify calendar events into projects based on their title and description."""
-        
-        event_title = dspy.InputField(desc="The title of the calendar event")
-        event_description = dspy.InputField(desc="The description of the calendar event (might be empty)")
-        project_names = dspy.InputField(desc="List of available project names to classify the event into")
-        
-        project_name = dspy.OutputField(desc="The most likely project name for this event, or 'unknown' if it doesn't match any project")
-        confidence = dspy.OutputField(desc="The confidence percentage (0-100) in this classification")
-        explanation = dspy.OutputField(desc="A brief explanation of why this project was chosen")
-    
     # Create a predictor using the signature
     predictor = dspy.Predict(ClassifyEvent)
     
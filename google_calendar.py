@@ -1,15 +1,31 @@
 import os
-import pickle
 import datetime
+import json
+import time
+import random
+import tempfile
+import threading
 from typing import List, Dict, Any, Optional, TypedDict, Union, Tuple
 import logging
+import operator
+import numpy as np
+import httplib2
+import google_auth_httplib2
 from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
 from datetime import timezone
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to googleapiclient's stdlib json decoding
+    orjson = None
+
 # Import our Pydantic models
-from models import CalendarEvent
+from models import CalendarEvent, CalendarEventLite
 from timeutils import get_time_of_day, TimeOfDay
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -18,6 +34,70 @@ logger = logging.getLogger(__name__)
 # Define the OAuth scope (read-only in this case)
 SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
 
+# Authorized-user credentials (access + refresh token) saved after the OAuth flow
+TOKEN_FILE = 'token_credentials.json'
+# Pickled credentials written by older versions, converted to TOKEN_FILE on first use
+LEGACY_TOKEN_FILE = 'token.pickle'
+
+# Time bounds are sent as RFC3339 UTC strings ('Z' indicates UTC time)
+_UTC = timezone.utc
+RFC3339_UTC_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+# Partial-response masks: only request the fields the app actually reads
+# (conferenceData, extendedProperties, etc. are skipped)
+EVENT_FIELDS = (
+    "nextPageToken,"
+    "items(id,status,htmlLink,created,updated,summary,description,location,"
+    "creator(email),organizer(email),start,end,recurringEventId,originalStartTime,"
+    "iCalUID,attendees(email,responseStatus,self),reminders,eventType)"
+)
+CALENDAR_LIST_FIELDS = "items(id,summary,primary,etag)"
+CALENDAR_FIELDS = "id,summary,etag"
+
+# Socket timeout (seconds) of the shared HTTP connection, and how often a request is
+# retried (with exponential backoff) on connection errors, 429 and 5xx responses
+HTTP_TIMEOUT = 30
+NUM_RETRIES = 3
+
+# Calendar API limit on the number of calls in one batch request
+MAX_BATCH_SIZE = 50
+
+# Events requested per events().list page
+EVENTS_PAGE_SIZE = 250
+
+# Services built by get_calendar_service, one per thread (httplib2.Http is not
+# thread-safe and Streamlit serves sessions on separate threads), reused while
+# their credentials are usable. Also holds the access token last saved by the thread.
+_thread_state = threading.local()
+
+# Serializes writes of TOKEN_FILE
+_token_lock = threading.Lock()
+
+# Sort key for calendars within list_calendars' primary/other partitions
+_by_summary = operator.itemgetter('summary')
+
+# Calendar names rarely change: cache id -> (expiry time, name, etag) for CALENDAR_NAME_TTL
+# seconds, persisted to CALENDAR_CACHE_FILE so new processes start warm. Expired entries
+# are revalidated with their etag instead of being downloaded again.
+CALENDAR_NAME_TTL = 600
+CALENDAR_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'ai-calendar', 'calendar_meta.json')
+_calendar_name_cache: Dict[str, Tuple[float, str, Optional[str]]] = {}
+_calendar_cache_lock = threading.Lock()
+_calendar_cache_loaded = False
+
+class OrjsonModel(JsonModel):
+    """JsonModel that decodes API responses with orjson."""
+
+    def deserialize(self, content):
+        try:
+            # orjson takes the raw bytes, no utf-8 decode step needed
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+            body = body['data']
+        return body
+
 # Type definitions for Google Calendar data
 class CalendarDateTime(TypedDict):
     """Calendar date/time representation with native datetime as primary field."""
@@ -39,7 +119,7 @@ def ensure_aware(dt: datetime.datetime) -> datetime.datetime:
         return dt.replace(tzinfo=timezone.utc)
     return dt
 
-def parse_datetime(dt_str: str) -> datetime.datetime:
+def parse_datetime(dt_str: str, _fromiso=datetime.datetime.fromisoformat) -> Optional[datetime.datetime]:
     """
     Parse a datetime string into a datetime object, handling different formats.
     
@@ -47,21 +127,19 @@ def parse_datetime(dt_str: str) -> datetime.datetime:
         dt_str: DateTime string from Google Calendar API
         
     Returns:
-        Python datetime object
+        Python datetime object, or None if the string is empty or unparseable
     """
     if not dt_str:
-        return datetime.datetime.now()
-        
+        return None
+    
+    # Google only ever puts the UTC marker at the end of an RFC3339 string
+    if dt_str[-1] == 'Z':
+        dt_str = dt_str[:-1] + '+00:00'
     try:
-        # Remove timezone info for simplicity
-        if 'Z' in dt_str:
-            dt_str = dt_str.replace('Z', '+00:00')
-            
-        # Parse the datetime string
-        return datetime.datetime.fromisoformat(dt_str)
-    except Exception as e:
+        return _fromiso(dt_str)
+    except ValueError as e:
         logger.warning(f"Could not parse datetime string: {dt_str}, {e}")
-        return datetime.datetime.now()
+        return None
 
 def extract_datetime_components(event: Dict[str, Any]) -> DateTimeComponents:
     """
@@ -73,53 +151,71 @@ def extract_datetime_components(event: Dict[str, Any]) -> DateTimeComponents:
     Returns:
         DateTimeComponents with native datetime object
     """
-    # Get the datetime object for the event start
-    dt = None
+    # Pre-parsed start_dt is the common case; otherwise fall back to the start block
+    dt = event.get('start_dt')
+    if dt is None:
+        start = event.get('start')
+        if start:
+            dt = start.get('native_dt') or parse_datetime(start.get('dateTime') or start.get('date') or '')
     
-    if 'start_dt' in event:
-        # Use pre-existing datetime if available
-        dt = event['start_dt']
-    elif 'start' in event:
-        start = event['start']
-        if 'native_dt' in start:
-            # Use pre-existing native_dt if available
-            dt = start['native_dt']
-        elif 'dateTime' in start:
-            # Parse from dateTime string
-            dt = parse_datetime(start['dateTime'])
-        elif 'date' in start:
-            # Parse from date string
-            dt = parse_datetime(start['date'])
-    # Don't set a default time if we couldn't extract a valid datetime
-    if not dt:
-        dt = None
-        logger.warning(f"Could not extract datetime from event")
-    # Create the simplified components
-    result: DateTimeComponents = {
-        'dt': dt,
-        'time_of_day': get_time_of_day(dt) if dt else ''
-    }
-    
-    return result
+    return {'dt': dt, 'time_of_day': get_time_of_day(dt) if dt else ''}
+
+def _save_credentials(creds: Credentials) -> None:
+    """Write the credentials to TOKEN_FILE atomically, so a crash never leaves a truncated token."""
+    tmp_path = TOKEN_FILE + '.tmp'
+    with _token_lock:
+        with open(tmp_path, 'w') as token:
+            token.write(creds.to_json())
+        os.replace(tmp_path, TOKEN_FILE)
+
+def _migrate_legacy_token() -> None:
+    """Convert a token.pickle left by older versions into TOKEN_FILE and remove it."""
+    import pickle  # only needed for this one-off conversion
+    try:
+        with open(LEGACY_TOKEN_FILE, 'rb') as token:
+            legacy_creds = pickle.load(token)
+        _save_credentials(legacy_creds)
+        os.remove(LEGACY_TOKEN_FILE)
+        logger.info(f"Converted {LEGACY_TOKEN_FILE} to {TOKEN_FILE}")
+    except Exception as e:
+        logger.error(f"Error converting {LEGACY_TOKEN_FILE}: {e}")
 
 def get_calendar_service():
     """
     Authenticate using desktop credentials and return the Google Calendar API service object.
-    This uses a token.pickle file to cache the credentials.
+    This uses a JSON token file (TOKEN_FILE) to cache the credentials, and the built service
+    is memoized per thread because building it parses the whole discovery document.
     
     Returns:
         googleapiclient.discovery.Resource: The Google Calendar API service.
     """
+    service = getattr(_thread_state, 'service', None)
+    if service is not None:
+        cached_creds = service._http.credentials
+        # AuthorizedHttp refreshes expired tokens itself as long as it has a refresh token
+        if cached_creds.valid or cached_creds.refresh_token:
+            # Persist a token AuthorizedHttp refreshed in memory since the last save
+            if cached_creds.token != _thread_state.saved_token:
+                try:
+                    _save_credentials(cached_creds)
+                    _thread_state.saved_token = cached_creds.token
+                    logger.info(f"Refreshed credentials saved to {TOKEN_FILE}")
+                except Exception as e:
+                    logger.error(f"Error saving credentials: {e}")
+            logger.info("Reusing cached Google Calendar API service")
+            return service
+    
     logger.info("Starting authentication process")
     creds = None
-    # Check if token.pickle exists
-    if os.path.exists('token.pickle'):
-        logger.info("Found existing token.pickle file")
-        with open('token.pickle', 'rb') as token:
-            creds = pickle.load(token)
-            logger.info("Loaded credentials from token.pickle")
+    if not os.path.exists(TOKEN_FILE) and os.path.exists(LEGACY_TOKEN_FILE):
+        _migrate_legacy_token()
+    # Check if the token file exists
+    if os.path.exists(TOKEN_FILE):
+        logger.info(f"Found existing {TOKEN_FILE} file")
+        creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
+        logger.info(f"Loaded credentials from {TOKEN_FILE}")
     else:
-        logger.info("No token.pickle file found")
+        logger.info(f"No {TOKEN_FILE} file found")
     
     # If there are no (valid) credentials available, start the OAuth flow.
     if not creds or not creds.valid:
@@ -153,23 +249,66 @@ def get_calendar_service():
         
         # Save the credentials for the next run
         try:
-            with open('token.pickle', 'wb') as token:
-                pickle.dump(creds, token)
-            logger.info("Credentials saved to token.pickle")
+            _save_credentials(creds)
+            logger.info(f"Credentials saved to {TOKEN_FILE}")
         except Exception as e:
             logger.error(f"Error saving credentials: {e}")
     else:
         logger.info("Using existing valid credentials")
     
-    # Build and return the Calendar API service object.
+    # Build and return the Calendar API service object. httplib2 keeps the
+    # connection open between requests, so every call on the service reuses it.
+    # The discovery document comes from the copy bundled with googleapiclient,
+    # so building never hits the network or probes for a discovery cache.
     try:
-        service = build('calendar', 'v3', credentials=creds)
+        http = google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+        model = OrjsonModel() if orjson is not None else None
+        service = build('calendar', 'v3', http=http, model=model, static_discovery=True, cache_discovery=False)
+        _thread_state.service = service
+        _thread_state.saved_token = creds.token
         logger.info("Google Calendar API service built successfully")
         return service
     except Exception as e:
         logger.error(f"Error building service: {e}")
         raise
 
+def _load_calendar_cache() -> None:
+    """Load the persisted calendar metadata into the in-memory cache on first use."""
+    global _calendar_cache_loaded
+    if _calendar_cache_loaded:
+        return
+    with _calendar_cache_lock:
+        if _calendar_cache_loaded:
+            return
+        _calendar_cache_loaded = True
+        if not os.path.exists(CALENDAR_CACHE_FILE):
+            return
+        try:
+            with open(CALENDAR_CACHE_FILE) as f:
+                entries = json.load(f)
+            for calendar_id, (expires_at, name, etag) in entries.items():
+                _calendar_name_cache[calendar_id] = (expires_at, name, etag)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable calendar cache {CALENDAR_CACHE_FILE}: {e}")
+
+def _save_calendar_cache() -> None:
+    """Persist the calendar metadata cache (written to a private temp file, then renamed into place)."""
+    cache_dir = os.path.dirname(CALENDAR_CACHE_FILE)
+    # Hold the lock so the dict isn't mutated mid-snapshot and writers replace the file in order
+    with _calendar_cache_lock:
+        entries = dict(_calendar_name_cache)
+        tmp_path = None
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, CALENDAR_CACHE_FILE)
+        except Exception as e:
+            logger.warning(f"Could not save calendar cache {CALENDAR_CACHE_FILE}: {e}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
 def list_calendars(service) -> List[CalendarInfo]:
     """
     List all calendars available in the user's account.
@@ -181,79 +320,173 @@ def list_calendars(service) -> List[CalendarInfo]:
         A list of dictionaries containing calendar information (id, summary, primary).
     """
     logger.info("Fetching list of available calendars")
+    _load_calendar_cache()
     try:
-        calendars_result = service.calendarList().list().execute()
+        calendars_result = service.calendarList().list(fields=CALENDAR_LIST_FIELDS).execute(num_retries=NUM_RETRIES)
         calendars = calendars_result.get('items', [])
         logger.info(f"Found {len(calendars)} calendars")
         
         # Format the calendar information
         formatted_calendars: List[CalendarInfo] = []
-        for calendar in calendars:
-            calendar_id = calendar['id']
-            calendar_summary = calendar.get('summary', 'Unnamed Calendar')
-            is_primary = calendar.get('primary', False)
-            
-            formatted_calendars.append({
-                'id': calendar_id,
-                'summary': calendar_summary,
-                'primary': is_primary
-            })
-            
-            logger.info(f"Calendar: {calendar_summary} (ID: {calendar_id}, Primary: {is_primary})")
+        expires_at = time.time() + CALENDAR_NAME_TTL
+        with _calendar_cache_lock:
+            for calendar in calendars:
+                calendar_id = calendar['id']
+                calendar_summary = calendar.get('summary', 'Unnamed Calendar')
+                is_primary = calendar.get('primary', False)
+                _calendar_name_cache[calendar_id] = (expires_at, calendar_summary, calendar.get('etag'))
+                
+                formatted_calendars.append({
+                    'id': calendar_id,
+                    'summary': calendar_summary,
+                    'primary': is_primary
+                })
         
-        # Sort calendars to put primary calendar first
-        formatted_calendars.sort(key=lambda c: (not c['primary'], c['summary']))
-        return formatted_calendars
+        _save_calendar_cache()
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Calendars: %s", [f"{c['summary']} ({c['id']})" for c in formatted_calendars])
+        
+        # Put the primary calendar first, then the others by name
+        primary = sorted((c for c in formatted_calendars if c['primary']), key=_by_summary)
+        others = sorted((c for c in formatted_calendars if not c['primary']), key=_by_summary)
+        return primary + others
     except Exception as e:
         logger.error(f"Error listing calendars: {e}")
         return []
 
-def fetch_events(service: Any, max_results: int = 100, calendar_ids: Optional[List[str]] = None, days_lookahead: int = 90) -> List[CalendarEvent]:
-    """Fetch events from specified calendars."""
+def _is_retryable(exception: Exception) -> bool:
+    """Whether a failed request is worth retrying: rate limits, server errors and transport errors."""
+    if isinstance(exception, HttpError):
+        return exception.resp.status == 429 or exception.resp.status >= 500
+    return isinstance(exception, (httplib2.HttpLib2Error, OSError))
+
+def _batch_list_events(service: Any, calendar_ids: List[str], time_min: str, time_max: str,
+                       max_results: int) -> List[Optional[List[Dict[str, Any]]]]:
+    """
+    Fetch up to max_results raw events of every calendar with batched events().list calls.
+    
+    Each round sends one batch request holding the next page of every calendar that
+    still has events to fetch, so N calendars cost one round trip instead of N.
+    BatchHttpRequest.execute has no num_retries, so requests that fail with a
+    retryable error (see _is_retryable), alone or with their whole batch, are sent
+    again in the next round after an exponential backoff, up to NUM_RETRIES times
+    per calendar.
+    
+    Returns:
+        The events of each calendar, in calendar_ids order (None if the calendar failed).
+    """
+    results: List[Optional[List[Dict[str, Any]]]] = [[] for _ in calendar_ids]
+    page_tokens: Dict[int, Optional[str]] = {position: None for position in range(len(calendar_ids))}
+    retries: Dict[int, int] = {}
+    retrying: List[int] = []
+    
+    def _fail(position, exception):
+        if _is_retryable(exception) and retries.get(position, 0) < NUM_RETRIES:
+            # Keep the page token, so the same page is requested again next round
+            retries[position] = retries.get(position, 0) + 1
+            retrying.append(position)
+            logger.warning(f"Retrying calendar {calendar_ids[position]} after error: {exception}")
+            return
+        logger.error(f"Error fetching events from calendar {calendar_ids[position]}: {exception}")
+        results[position] = None
+        page_tokens.pop(position, None)
+    
+    def _collect(request_id, response, exception):
+        position = int(request_id)
+        if exception is not None:
+            _fail(position, exception)
+            return
+        events = results[position]
+        events.extend(response.get('items', []))
+        next_token = response.get('nextPageToken')
+        if next_token and len(events) < max_results:
+            page_tokens[position] = next_token
+        else:
+            del events[max_results:]
+            del page_tokens[position]
+    
+    while page_tokens:
+        if retrying:
+            # Same backoff as googleapiclient's num_retries: up to 2**n seconds, with jitter
+            time.sleep(random.random() * 2 ** max(retries[position] for position in retrying))
+            retrying.clear()
+        pending = list(page_tokens.items())
+        for chunk_start in range(0, len(pending), MAX_BATCH_SIZE):
+            chunk = pending[chunk_start:chunk_start + MAX_BATCH_SIZE]
+            batch = service.new_batch_http_request(callback=_collect)
+            for position, page_token in chunk:
+                batch.add(service.events().list(
+                    calendarId=calendar_ids[position],
+                    timeMin=time_min,
+                    timeMax=time_max,
+                    maxResults=min(max_results - len(results[position]), EVENTS_PAGE_SIZE),
+                    pageToken=page_token,
+                    singleEvents=True,
+                    orderBy='startTime',
+                    fields=EVENT_FIELDS
+                ), request_id=str(position))
+            try:
+                batch.execute()
+            except Exception as e:
+                # The whole batch failed (e.g. a timeout): only its calendars are affected
+                for position, _ in chunk:
+                    _fail(position, e)
+    
+    return results
+
+def fetch_events(service: Any, max_results: int = 100, calendar_ids: Optional[List[str]] = None, days_lookahead: int = 90,
+                 lite: bool = False) -> Union[List[CalendarEvent], List[CalendarEventLite]]:
+    """Fetch events from specified calendars.
+    
+    Set lite to get CalendarEventLite objects (e.g. for scheduling only) instead
+    of full CalendarEvent models.
+    """
     if not calendar_ids:
         calendar_ids = ['primary']
     
     # Calculate time bounds
-    now = datetime.datetime.utcnow().isoformat() + 'Z'  # 'Z' indicates UTC time
-    future = (datetime.datetime.utcnow() + datetime.timedelta(days=days_lookahead)).isoformat() + 'Z'
+    now_utc = datetime.datetime.now(_UTC)
+    now = now_utc.strftime(RFC3339_UTC_FORMAT)
+    future = (now_utc + datetime.timedelta(days=days_lookahead)).strftime(RFC3339_UTC_FORMAT)
     
-    # Fetch events from all specified calendars
+    # Fetch events from all specified calendars, keeping their start timestamps
+    # in a parallel array so sorting never touches the event objects
     all_events = []
+    starts: List[float] = []
     
-    for calendar_id in calendar_ids:
-        try:
-            logger.info(f"Fetching events from calendar: {calendar_id}")
-            
-            events_result = service.events().list(
-                calendarId=calendar_id,
-                timeMin=now,
-                timeMax=future,
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
-            logger.info(f"Found {len(events)} events in calendar {calendar_id}")
-            
-            # Process each event
-            for event in events:
-                # Add calendar ID to the event
-                event['calendar_id'] = calendar_id
-                # Create a CalendarEvent using the Pydantic model
-                calendar_event = CalendarEvent.from_google_dict(event)
-                all_events.append(calendar_event)
-                
-        except Exception as e:
-            logger.error(f"Error fetching events from calendar {calendar_id}: {e}")
-            logger.exception(e)
+    # Calendars whose requests failed come back as None; the others are kept
+    try:
+        calendar_events = _batch_list_events(service, calendar_ids, now, future, max_results)
+    except Exception as e:
+        logger.error(f"Error fetching events: {e}")
+        logger.exception(e)
+        return []
+    
+    _ensure_aware = ensure_aware
+    from_google_lite = CalendarEventLite.from_google
+    inf = float('inf')
     
-    # Sort all events by start time
-    if all_events:
-        # Sort CalendarEvent objects by their start_dt property
-        all_events.sort(key=lambda e: e.start_dt or datetime.datetime.max)
-            
-    return all_events
+    for calendar_id, events in zip(calendar_ids, calendar_events):
+        if events is None:
+            continue
+        logger.debug("Found %d events in calendar %s", len(events), calendar_id)
+        
+        # Create the CalendarEvents in one go; the API payload is trusted, so skip validation
+        if lite:
+            calendar_events_models = [from_google_lite(event, calendar_id) for event in events]
+        else:
+            calendar_events_models = CalendarEvent.from_google_dicts_bulk(events, calendar_id)
+        all_events.extend(calendar_events_models)
+        starts.extend([
+            _ensure_aware(event.start_dt).timestamp() if event.start_dt else inf
+            for event in calendar_events_models
+        ])
+    
+    # Sort all events by start time (stable, so ties keep calendar order)
+    order = np.argsort(np.asarray(starts), kind='stable')
+    logger.info("Fetched %d events from %d calendars", len(all_events), len(calendar_ids))
+    return [all_events[i] for i in order]
 
 def get_calendar_name(service, calendar_id: str) -> str:
     """
@@ -266,9 +499,36 @@ def get_calendar_name(service, calendar_id: str) -> str:
     Returns:
         The name of the calendar, or the ID if not found.
     """
+    _load_calendar_cache()
+    now = time.time()
+    cached = _calendar_name_cache.get(calendar_id)
+    if cached is not None and cached[0] >= now:
+        return cached[1]
+    if cached is None:
+        # One calendarList call caches the names of all calendars at once
+        list_calendars(service)
+        cached = _calendar_name_cache.get(calendar_id)
+        if cached is not None and cached[0] >= now:
+            return cached[1]
+    
+    # Expired, or not in the user's calendar list: look the calendar up directly,
+    # letting the server answer 304 Not Modified if the cached etag still matches
     try:
-        calendar = service.calendarList().get(calendar_id=calendar_id).execute()
-        return calendar.get('summary', calendar_id)
+        request = service.calendarList().get(calendarId=calendar_id, fields=CALENDAR_FIELDS)
+        if cached is not None and cached[2]:
+            request.headers['If-None-Match'] = cached[2]
+        calendar = request.execute(num_retries=NUM_RETRIES)
+        name, etag = calendar.get('summary', calendar_id), calendar.get('etag')
+    except HttpError as e:
+        if cached is None or e.resp.status != 304:
+            logger.error(f"Error getting calendar info for {calendar_id}: {e}")
+            return calendar_id
+        name, etag = cached[1], cached[2]
     except Exception as e:
         logger.error(f"Error getting calendar info for {calendar_id}: {e}")
-        return calendar_id
\ No newline at end of file
+        return calendar_id
+    
+    with _calendar_cache_lock:
+        _calendar_name_cache[calendar_id] = (time.time() + CALENDAR_NAME_TTL, name, etag)
+    _save_calendar_cache()
+    return name
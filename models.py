@@ -6,14 +6,16 @@ This module provides consistent, type-validated models for calendar events
 and related data structures used throughout the application.
 """
 
-from datetime import datetime, date, time
+from dataclasses import dataclass
+from datetime import datetime, date
 from typing import Dict, List, Optional, Union, Any, Literal
 from enum import Enum
 import json
+import sys
 
 from pydantic import BaseModel, Field, model_validator, field_validator, ConfigDict
 
-from timeutils import TimeOfDay, get_time_of_day, DateTimeEncoder
+from timeutils import TimeOfDay, get_time_of_day, DateTimeEncoder, json_dumps, json_loads
 
 class EventAttendee(BaseModel):
     """Model for a calendar event attendee."""
@@ -27,6 +29,92 @@ class EventAttendee(BaseModel):
     is_resource: Optional[bool] = Field(None, alias="resource")
 
 
+# English weekday names by datetime.weekday(), as strftime("%A") gives them in the
+# default C locale, without formatting a string per event
+_DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+# Parsed event times by their source string. Recurring instances, all-day dates and
+# back-to-back events repeat the same strings, and datetimes are immutable, so
+# parses can be shared. Bounded so long-running processes don't grow it forever.
+_PARSED_EVENT_TIMES: Dict[str, datetime] = {}
+_PARSED_EVENT_TIMES_MAX = 4096
+
+
+def _parse_event_time(date_time: Optional[str], date_str: Optional[str]) -> Optional[datetime]:
+    """Derive the native datetime from a Google Calendar dateTime or date string."""
+    source = date_time or date_str
+    if not source:
+        return None
+    dt = _PARSED_EVENT_TIMES.get(source)
+    if dt is not None:
+        return dt
+    
+    # Try to parse date_time
+    if date_time:
+        try:
+            # Google only ever puts the 'Z' (UTC) marker at the end of an RFC3339 string
+            if date_time[-1] == 'Z':
+                date_time = date_time[:-1] + '+00:00'
+            dt = datetime.fromisoformat(date_time)
+        except Exception as e:
+            print(f"Error parsing dateTime: {e}")
+            
+    # Try to parse date_str
+    else:
+        try:
+            # For date-only events, use midnight ('YYYY-MM-DD' parses straight to it)
+            dt = datetime.fromisoformat(date_str)
+        except Exception as e:
+            print(f"Error parsing date: {e}")
+    
+    if dt is not None and len(_PARSED_EVENT_TIMES) < _PARSED_EVENT_TIMES_MAX:
+        _PARSED_EVENT_TIMES[source] = dt
+    return dt
+
+
+def _google_event_fields(event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Map the plain (non-time) fields of a Google Calendar API event to CalendarEvent fields.
+    
+    Only the keys present in the event are visited; events usually carry few of them.
+    """
+    fields = {'id': '', 'summary': 'Untitled Event'}
+    field_map = _GOOGLE_EVENT_FIELD_MAP
+    for key, value in event_dict.items():
+        name = field_map.get(key)
+        if name is not None:
+            fields[name] = value
+    return fields
+
+
+# Defaults of each model's fields, in declaration order (see _construct_trusted)
+_FIELD_DEFAULTS: Dict[type, Dict[str, Any]] = {}
+
+
+def _construct_trusted(cls, values: Dict[str, Any]):
+    """
+    Build a model instance from trusted values without validation.
+    
+    Equivalent to cls.model_construct(**values), but the defaults come from a
+    template computed once per class instead of being resolved field by field.
+    Only for models without extra fields, private attributes or mutable defaults.
+    """
+    defaults = _FIELD_DEFAULTS.get(cls)
+    if defaults is None:
+        defaults = _FIELD_DEFAULTS[cls] = {
+            name: None if field.is_required() else field.get_default(call_default_factory=True)
+            for name, field in cls.model_fields.items()
+        }
+    instance = cls.__new__(cls)
+    data = defaults.copy()
+    data.update(values)
+    object.__setattr__(instance, '__dict__', data)
+    object.__setattr__(instance, '__pydantic_fields_set__', set(values))
+    object.__setattr__(instance, '__pydantic_extra__', None)
+    object.__setattr__(instance, '__pydantic_private__', None)
+    return instance
+
+
 class CalendarEventTime(BaseModel):
     """
     Model for calendar event time information.
@@ -45,29 +133,8 @@ class CalendarEventTime(BaseModel):
     def set_dt_after_validation(self):
         """Process datetime after validation."""
         # If dt is already set, keep it
-        if self.dt is not None:
-            return self
-            
-        # Try to parse date_time
-        if self.date_time:
-            try:
-                # Handle 'Z' timezone marker
-                dt_str = self.date_time
-                if isinstance(dt_str, str) and 'Z' in dt_str:
-                    dt_str = dt_str.replace('Z', '+00:00')
-                self.dt = datetime.fromisoformat(dt_str)
-            except Exception as e:
-                print(f"Error parsing dateTime: {e}")
-                
-        # Try to parse date_str
-        elif self.date_str:
-            try:
-                # For date-only events, use midnight
-                date_obj = datetime.fromisoformat(self.date_str).date()
-                self.dt = datetime.combine(date_obj, time())
-            except Exception as e:
-                print(f"Error parsing date: {e}")
-                
+        if self.dt is None:
+            self.dt = _parse_event_time(self.date_time, self.date_str)
         return self
     
     def model_dump(self, *args, **kwargs):
@@ -80,13 +147,20 @@ class CalendarEventTime(BaseModel):
             if "dt" in result:
                 del result["dt"]
         return result
+    
+    def isoformat(self) -> str:
+        """ISO 8601 form of the time: the API's own dateTime string when there is one."""
+        if self.date_time:
+            return self.date_time
+        return self.dt.isoformat() if self.dt else ""
         
     @classmethod
-    def from_google_dict(cls, event_time_dict: Dict[str, Any]) -> "CalendarEventTime":
+    def from_google_dict(cls, event_time_dict: Dict[str, Any], validate: bool = True) -> "CalendarEventTime":
         """Create a CalendarEventTime from a Google Calendar API datetime dictionary.
         
         Args:
             event_time_dict: Dictionary containing date or dateTime from Google Calendar
+            validate: Set to False for trusted API data to skip Pydantic validation
             
         Returns:
             CalendarEventTime instance
@@ -95,6 +169,14 @@ class CalendarEventTime(BaseModel):
         date_time = event_time_dict.get('dateTime')
         date_str = event_time_dict.get('date')
         
+        # Nothing to validate or parse for a missing time
+        if not validate or not (date_time or date_str):
+            return _construct_trusted(cls, {
+                'date_time': date_time,
+                'date_str': date_str,
+                'dt': _parse_event_time(date_time, date_str)
+            })
+        
         # Create CalendarEventTime instance
         return cls(
             dateTime=date_time,
@@ -110,7 +192,7 @@ class CalendarEvent(BaseModel):
     throughout the application, providing consistent validation and serialization.
     """
     # Configuration for ORM mode
-    model_config = ConfigDict(from_attributes=True, arbitrary_types_allowed=True)
+    model_config = ConfigDict(from_attributes=True, arbitrary_types_allowed=True, populate_by_name=True)
     
     # Core Google Calendar fields
     id: str
@@ -203,12 +285,14 @@ class CalendarEvent(BaseModel):
         Returns:
             Dict with required fields for the classification process
         """
+        start_dt = self.start_dt
         return {
             "event": f"{self.summary} {self.description or ''}".strip(),
             "calendar": self.calendar_id or "",
-            "iso_time": self.start_dt.isoformat() if self.start_dt else "",
-            "day_of_week": self.start_dt.strftime("%A") if self.start_dt else "",
-            "time_of_day": self.time_of_day or TimeOfDay.UNKNOWN,
+            "iso_time": start_dt.isoformat() if start_dt else "",
+            "day_of_week": _DAY_NAMES[start_dt.weekday()] if start_dt else "",
+            # Plain string: str-Enum members hash and compare through Python-level methods
+            "time_of_day": (self.time_of_day or TimeOfDay.UNKNOWN).value,
             "created": self.created or "",
             "updated": self.updated or "",
             "creator": self.creator_email or "",
@@ -222,67 +306,205 @@ class CalendarEvent(BaseModel):
         """Custom model_dump method to handle datetime objects."""
         data = super().model_dump(*args, **kwargs)
         
-        # Process nested datetime objects
-        if 'start' in data and 'dt' in data['start']:
-            if data['start']['dt']:
-                data['start']['dt_iso'] = data['start']['dt'].isoformat()
-            del data['start']['dt']
-            
-        if 'end' in data and 'dt' in data['end']:
-            if data['end']['dt']:
-                data['end']['dt_iso'] = data['end']['dt'].isoformat()
-            del data['end']['dt']
-            
+        # Process nested datetime objects, stored under the alias when dumped by_alias
+        for name in ('start', 'end', 'original_start_time'):
+            key = name if name in data else type(self).model_fields[name].alias
+            event_time = data.get(key)
+            if event_time and 'dt' in event_time:
+                if event_time['dt']:
+                    event_time['dt_iso'] = event_time['dt'].isoformat()
+                del event_time['dt']
+
         return data
-    
+
+    def to_db_dict(self) -> Dict[str, Any]:
+        """Convert to a dictionary suitable for database storage."""
+        return {
+            "event_id": self.id,
+            "title": self.summary,
+            "description": self.description or "",
+            "start_time": self.start.isoformat(),
+            "end_time": self.end.isoformat(),
+            "calendar_id": self.calendar_id or "",
+            "project_id": self.project_id,
+            "raw_event_data": json_dumps(self.model_dump(by_alias=True))
+        }
+
     @classmethod
-    def from_google_dict(cls, event_dict: Dict[str, Any], calendar_id: Optional[str] = None) -> 'CalendarEvent':
+    def from_db_dict(cls, db_dict: Dict[str, Any]) -> "CalendarEvent":
+        """Create a CalendarEvent from database dictionary.
+
+        The full event is restored from raw_event_data when present; the columns
+        take precedence for the fields the application edits (title, description,
+        project).
+        """
+        raw_event_data = db_dict.get("raw_event_data")
+        data = json_loads(raw_event_data) if raw_event_data else {
+            "start": {"dateTime": db_dict.get("start_time") or None},
+            "end": {"dateTime": db_dict.get("end_time") or None},
+            "calendar_id": db_dict.get("calendar_id") or None
+        }
+        data.update(
+            id=db_dict.get("event_id", ""),
+            summary=db_dict.get("title", ""),
+            description=db_dict.get("description", ""),
+            project_id=db_dict.get("project_id")
+        )
+        # Calendar IDs and project names repeat across events: share one string each
+        for key in ("calendar_id", "project_name"):
+            if data.get(key):
+                data[key] = sys.intern(data[key])
+        return cls.model_validate(data)
+
+    @classmethod
+    def from_google_dict(cls, event_dict: Dict[str, Any], calendar_id: Optional[str] = None,
+                         validate: bool = True) -> 'CalendarEvent':
         """Create a CalendarEvent from a Google Calendar API event dictionary.
         
         Args:
             event_dict: Dictionary from Google Calendar API
             calendar_id: Calendar ID, if not included in the event dictionary
+            validate: Set to False for trusted API data (e.g. bulk fetches) to build
+                the model with model_construct and skip Pydantic validation
             
         Returns:
             CalendarEvent instance
         """
-        # Create start and end time objects
-        start = CalendarEventTime.from_google_dict(event_dict.get('start', {}))
-        end = CalendarEventTime.from_google_dict(event_dict.get('end', {}))
+        # Create start and end time objects; zero-duration events reuse the start's
+        # parse as a copy instead of validating the same dictionary twice
+        start_dict = event_dict.get('start', {})
+        end_dict = event_dict.get('end', {})
+        start = CalendarEventTime.from_google_dict(start_dict, validate=validate)
+        if end_dict == start_dict:
+            end = start.model_copy()
+        else:
+            end = CalendarEventTime.from_google_dict(end_dict, validate=validate)
+        original_start = event_dict.get('originalStartTime')
         
         # Use provided calendar_id or the one in event_dict
         cal_id = calendar_id or event_dict.get('calendar_id') or event_dict.get('calendarId')
         
-        # Create the event with required fields
-        return cls(
-            id=event_dict.get('id', ''),
-            summary=event_dict.get('summary', 'Untitled Event'),
+        fields = _google_event_fields(event_dict)
+        fields.update(
             start=start,
             end=end,
-            
-            # Optional fields with proper defaults
-            kind=event_dict.get('kind'),
-            etag=event_dict.get('etag'),
-            status=event_dict.get('status'),
-            html_link=event_dict.get('htmlLink'),
-            created=event_dict.get('created'),
-            updated=event_dict.get('updated'),
-            description=event_dict.get('description'),
-            location=event_dict.get('location'),
             calendar_id=cal_id,
-            creator=event_dict.get('creator'),
-            organizer=event_dict.get('organizer'),
-            attendees=event_dict.get('attendees'),
-            recurring_event_id=event_dict.get('recurringEventId'),
-            original_start_time=CalendarEventTime.from_google_dict(event_dict.get('originalStartTime', {})) if event_dict.get('originalStartTime') else None,
-            ical_uid=event_dict.get('iCalUID'),
-            sequence=event_dict.get('sequence'),
-            extended_properties=event_dict.get('extendedProperties'),
-            hangout_link=event_dict.get('hangoutLink'),
-            conference_data=event_dict.get('conferenceData'),
-            reminders=event_dict.get('reminders'),
-            event_type=event_dict.get('eventType')
+            original_start_time=CalendarEventTime.from_google_dict(original_start, validate=validate) if original_start else None
+        )
+        
+        if not validate:
+            # Construction skips validators, so derive time_of_day here
+            fields['time_of_day'] = get_time_of_day(start.dt) if start.dt else None
+            return _construct_trusted(cls, fields)
+        
+        # Create the event with required fields
+        return cls(**fields)
+    
+    @classmethod
+    def from_google_dicts_bulk(cls, event_dicts: List[Dict[str, Any]],
+                               calendar_id: Optional[str] = None) -> List['CalendarEvent']:
+        """Create CalendarEvents from trusted Google Calendar API event dictionaries.
+        
+        Same result as from_google_dict(event_dict, calendar_id, validate=False) for
+        each dictionary, with the per-event lookups hoisted out of the loop.
+        
+        Args:
+            event_dicts: Event dictionaries from Google Calendar API
+            calendar_id: Calendar ID, if not included in the event dictionaries
+            
+        Returns:
+            List of CalendarEvent instances, in input order
+        """
+        construct = _construct_trusted
+        time_cls = CalendarEventTime
+        time_from_google = CalendarEventTime.from_google_dict
+        parse = _parse_event_time
+        time_of_day = get_time_of_day
+        event_fields = _google_event_fields
+        
+        events = []
+        add = events.append
+        for event_dict in event_dicts:
+            get = event_dict.get
+            start_dict = get('start') or {}
+            end_dict = get('end') or {}
+            start_dt = parse(start_dict.get('dateTime'), start_dict.get('date'))
+            original_start = get('originalStartTime')
+            
+            fields = event_fields(event_dict)
+            fields.update(
+                start=construct(time_cls, {'date_time': start_dict.get('dateTime'), 'date_str': start_dict.get('date'),
+                                           'dt': start_dt}),
+                end=construct(time_cls, {'date_time': end_dict.get('dateTime'), 'date_str': end_dict.get('date'),
+                                         'dt': parse(end_dict.get('dateTime'), end_dict.get('date'))}),
+                calendar_id=calendar_id or get('calendar_id') or get('calendarId'),
+                original_start_time=time_from_google(original_start, validate=False) if original_start else None,
+                time_of_day=time_of_day(start_dt) if start_dt else None
+            )
+            add(construct(cls, fields))
+        return events
+
+
+# Google API key -> CalendarEvent field, for the fields copied verbatim from the API
+# (times and the calendar id are handled separately; the classification fields are ours)
+_GOOGLE_EVENT_FIELD_MAP = {
+    field.alias or name: name
+    for name, field in CalendarEvent.model_fields.items()
+    if name not in {'start', 'end', 'original_start_time', 'calendar_id',
+                    'project_id', 'project_name', 'classification_confidence', 'time_of_day'}
+}
+
+
+@dataclass(slots=True)
+class CalendarEventLite:
+    """
+    Lightweight, unvalidated view of a Google Calendar event.
+    
+    Holds only the fields needed for listing and scheduling, without Pydantic state,
+    for callers that handle many events. Use to_full() when the complete
+    CalendarEvent is needed (e.g. for persistence).
+    """
+    id: str
+    summary: str
+    start_dt: Optional[datetime]
+    end_dt: Optional[datetime]
+    calendar_id: Optional[str]
+    time_of_day: Optional[TimeOfDay]
+    description: Optional[str] = None
+    attendees: Optional[List[Dict[str, Any]]] = None
+    raw: Optional[Dict[str, Any]] = None
+    
+    @classmethod
+    def from_google(cls, event_dict: Dict[str, Any], calendar_id: Optional[str] = None) -> 'CalendarEventLite':
+        """Create a CalendarEventLite from a Google Calendar API event dictionary.
+        
+        Args:
+            event_dict: Dictionary from Google Calendar API
+            calendar_id: Calendar ID, if not included in the event dictionary
+            
+        Returns:
+            CalendarEventLite instance (keeps a reference to event_dict for to_full)
+        """
+        get = event_dict.get
+        start = get('start') or {}
+        end = get('end') or {}
+        start_dt = _parse_event_time(start.get('dateTime'), start.get('date'))
+        return cls(
+            get('id', ''),
+            get('summary', 'Untitled Event'),
+            start_dt,
+            _parse_event_time(end.get('dateTime'), end.get('date')),
+            calendar_id or get('calendar_id') or get('calendarId'),
+            get_time_of_day(start_dt) if start_dt else None,
+            get('description'),
+            get('attendees'),
+            event_dict
         )
+    
+    def to_full(self) -> CalendarEvent:
+        """Build the complete CalendarEvent from the original API dictionary."""
+        return CalendarEvent.from_google_dict(self.raw or {'id': self.id, 'summary': self.summary},
+                                              self.calendar_id, validate=False)
 
 
 class Project(BaseModel):
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Offline optimization of the debug event classifier with DSPy MIPROv2.
+Compiles the ClassifyEvent prompt against already classified events and saves
+it to classify_event.optimized.json, which debug_classification.setup_dspy reuses.
+"""
+
+import sqlite3
+import logging
+from typing import List
+
+import dspy
+from dspy.teleprompt import MIPROv2
+
+from debug_classification import DB_PATH, OPTIMIZED_PROGRAM_PATH, setup_dspy
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def load_trainset() -> List[dspy.Example]:
+    """Build DSPy examples from events that already have a project assigned."""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT name FROM projects ORDER BY id")
+        project_names = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute("""
+            SELECT e.summary, e.description, p.name
+            FROM events e
+            JOIN projects p ON p.id = e.project_id
+        """)
+        rows = cursor.fetchall()
+    except Exception as e:
+        logger.error(f"Error loading labeled events: {e}")
+        return []
+    finally:
+        conn.close()
+
+    trainset = [
+        dspy.Example(
+            event_title=title or "",
+            event_description=description or "",
+            project_names=project_names,
+            project_name=project_name,
+            confidence="100",
+            explanation="Manually classified event",
+        ).with_inputs('event_title', 'event_description', 'project_names')
+        for title, description, project_name in rows
+    ]
+    logger.info(f"Loaded {len(trainset)} labeled events")
+    return trainset
+
+def exact_match(example: dspy.Example, prediction: dspy.Prediction, trace=None) -> bool:
+    """Score a prediction by its (case-insensitive) project name."""
+    return example.project_name.strip().lower() == str(prediction.project_name).strip().lower()
+
+def main():
+    """Compile the classifier and save the optimized program."""
+    trainset = load_trainset()
+    if not trainset:
+        logger.error("No labeled events available, classify some events first")
+        return
+
+    predictor = setup_dspy()
+    optimizer = MIPROv2(metric=exact_match, auto="light")
+    optimized = optimizer.compile(predictor, trainset=trainset)
+    optimized.save(OPTIMIZED_PROGRAM_PATH)
+    logger.info(f"Saved optimized classifier to {OPTIMIZED_PROGRAM_PATH}")
+
+if __name__ == "__main__":
+    main()
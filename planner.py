@@ -1,20 +1,27 @@
 import sqlite3
+from itertools import groupby
 
-conn = sqlite3.connect("planner.db")
+# Read-only: inspecting the schema never needs to create or journal the database
+conn = sqlite3.connect("file:planner.db?mode=ro", uri=True)
 cursor = conn.cursor()
 
+# Fetch the columns of every table in a single query
+cursor.execute("""
+    SELECT m.name, p.cid, p.name, p.type, p."notnull", p.dflt_value, p.pk
+    FROM sqlite_master m JOIN pragma_table_info(m.name) p
+    WHERE m.type = 'table'
+    ORDER BY m.rowid, p.cid
+""")
+rows = cursor.fetchall()
+
 # List all tables
-cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-tables = cursor.fetchall()
+tables = [(table_name,) for table_name, _ in groupby(rows, key=lambda row: row[0])]
 print("Tables in the database:", tables)
 
 # For each table, show its structure
-for table in tables:
-    table_name = table[0]
-    cursor.execute(f"PRAGMA table_info({table_name})")
-    columns = cursor.fetchall()
+for table_name, columns in groupby(rows, key=lambda row: row[0]):
     print(f"\nStructure of table '{table_name}':")
     for column in columns:
-        print(column)
+        print(column[1:])
 
-conn.close()
\ No newline at end of file
+conn.close()
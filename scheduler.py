@@ -1,9 +1,12 @@
 """
 Scheduler module for planning interview practice sessions based on calendar events.
 """
+from bisect import bisect_right
 from datetime import datetime, timedelta, timezone
 from typing import List, Tuple, Dict, Any, Optional
 
+import numpy as np
+
 # Other imports if needed
 try:
     from models import CalendarEvent, TimeOfDay
@@ -12,14 +15,20 @@ except ImportError:
     CalendarEvent = None
     TimeOfDay = None
 
-def schedule_practice(events, duration_minutes=60, days_ahead=14):
+# Busy intervals are parsed and merged at microsecond resolution, like datetime
+BUSY_DTYPE = 'datetime64[us]'
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+def schedule_practice(events, duration_minutes=60, days_ahead=14, max_suggestions=None):
     """
     Schedule practice sessions based on available time slots.
     
     Args:
-        events: List of events (can be dictionaries or CalendarEvent objects)
+        events: List of events (dictionaries, CalendarEvent or CalendarEventLite objects)
         duration_minutes: Duration of practice sessions in minutes
         days_ahead: Number of days ahead to schedule
+        max_suggestions: Stop after this many (earliest) sessions; None for all of them
         
     Returns:
         List of (start_time, end_time) tuples for suggested practice sessions
@@ -29,8 +38,18 @@ def schedule_practice(events, duration_minutes=60, days_ahead=14):
     START_HOUR = 9  # 9 AM
     END_HOUR = 22   # 10 PM
     
-    # Create a set of busy times from the events
-    busy_times = []
+    # Define the range to check for available slots
+    now = datetime.now().replace(tzinfo=None)  # Ensure now is naive
+    end_date = now + timedelta(days=days_ahead)
+    
+    # Only busy times overlapping the scheduled days matter (the last day ends by end_date + 1 day)
+    horizon_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    horizon_end = end_date + timedelta(days=1)
+    
+    # Collect busy times from the events: RFC3339 strings from dictionaries,
+    # epoch microseconds from CalendarEvent models (both as naive local wall-clock times)
+    busy_strings = []
+    busy_micros = []
     
     for event in events:
         # Handle both dictionary and Pydantic model formats
@@ -40,46 +59,26 @@ def schedule_practice(events, duration_minutes=60, days_ahead=14):
             end_str = event.get('end', {}).get('dateTime')
             
             if start_str and end_str:
-                # Convert to datetime objects
-                try:
-                    # Handle 'Z' timezone marker
-                    if 'Z' in start_str:
-                        start_str = start_str.replace('Z', '+00:00')
-                    if 'Z' in end_str:
-                        end_str = end_str.replace('Z', '+00:00')
-                        
-                    start_time = datetime.fromisoformat(start_str)
-                    end_time = datetime.fromisoformat(end_str)
-                    
-                    # Convert to naive datetime if timezone-aware
-                    if start_time.tzinfo is not None:
-                        start_time = start_time.replace(tzinfo=None)
-                    if end_time.tzinfo is not None:
-                        end_time = end_time.replace(tzinfo=None)
-                        
-                    busy_times.append((start_time, end_time))
-                except Exception as e:
-                    print(f"Error parsing event times: {e}")
+                busy_strings.append((_wall_clock(start_str), _wall_clock(end_str)))
         else:
             # Event is a CalendarEvent Pydantic model
             start_dt = getattr(event, 'start_dt', None)
             end_dt = getattr(event, 'end_dt', None)
             
             if start_dt and end_dt:
-                # Convert to naive datetime if timezone-aware
-                if start_dt.tzinfo is not None:
-                    start_dt = start_dt.replace(tzinfo=None)
-                if end_dt.tzinfo is not None:
-                    end_dt = end_dt.replace(tzinfo=None)
-                    
-                busy_times.append((start_dt, end_dt))
-    
-    # Sort busy times by start time
-    busy_times.sort()
+                start_dt = start_dt.replace(tzinfo=None)
+                end_dt = end_dt.replace(tzinfo=None)
+                if start_dt < horizon_end and end_dt > horizon_start:
+                    # Integer microseconds convert to datetime64 far faster than datetime objects
+                    busy_micros.append(((start_dt - _EPOCH) // _MICROSECOND, (end_dt - _EPOCH) // _MICROSECOND))
     
-    # Define the range to check for available slots
-    now = datetime.now().replace(tzinfo=None)  # Ensure now is naive
-    end_date = now + timedelta(days=days_ahead)
+    # Parse and merge the busy times as datetime64 arrays, then hand the (few)
+    # merged intervals back to the slot sweep as Python datetimes
+    parsed = _parse_busy_strings(busy_strings)
+    parsed = parsed[(parsed[:, 0] < np.datetime64(horizon_end)) & (parsed[:, 1] > np.datetime64(horizon_start))]
+    busy = np.concatenate((parsed, np.array(busy_micros, dtype=np.int64).reshape(-1, 2).view(BUSY_DTYPE)))
+    busy_times = [tuple(interval) for interval in merge_intervals(busy).astype(object)]
+    busy_ends = [busy_end for _, busy_end in busy_times]
     
     # Generate potential practice slots
     available_slots = []
@@ -91,31 +90,105 @@ def schedule_practice(events, duration_minutes=60, days_ahead=14):
     
     while current_date < end_date:
         day_end = current_date.replace(hour=END_HOUR, minute=0, second=0, microsecond=0)
-        slot_start = current_date
         
-        # Check each potential slot against busy times
-        while slot_start + PRACTICE_DURATION <= day_end:
-            slot_end = slot_start + PRACTICE_DURATION
-            
-            # Check if slot overlaps with any busy time
-            is_available = True
-            for busy_start, busy_end in busy_times:
-                # Check for overlap
-                if (slot_start < busy_end and slot_end > busy_start):
-                    is_available = False
-                    # Move to the end of this busy period
-                    slot_start = busy_end
-                    break
-            
-            if is_available:
-                available_slots.append((slot_start, slot_end))
-                slot_start += PRACTICE_DURATION
-            else:
-                # If not available, slot_start has already been updated
-                # to the end of the overlapping busy period
-                pass
+        # Tile each free window of the day with back-to-back slots
+        for window_start, window_end in free_windows(current_date, day_end, busy_times, busy_ends):
+            available_slots.extend(
+                (window_start + k * PRACTICE_DURATION, window_start + (k + 1) * PRACTICE_DURATION)
+                for k in range((window_end - window_start) // PRACTICE_DURATION)
+            )
+        
+        # Later days can only add later slots
+        if max_suggestions is not None and len(available_slots) >= max_suggestions:
+            return available_slots[:max_suggestions]
         
         # Move to the next day
         current_date = current_date + timedelta(days=1)
     
-    return available_slots
\ No newline at end of file
+    return available_slots
+
+
+def free_windows(day_start: datetime, day_end: datetime,
+                 busy_times: List[Tuple[datetime, datetime]],
+                 busy_ends: List[datetime]) -> List[Tuple[datetime, datetime]]:
+    """
+    Compute the free windows of [day_start, day_end).
+    
+    Args:
+        day_start: Start of the schedulable part of the day
+        day_end: End of the schedulable part of the day
+        busy_times: Disjoint busy intervals sorted by start (see merge_intervals)
+        busy_ends: The end times of busy_times, for bisecting
+        
+    Returns:
+        List of (start, end) tuples of the free windows, in order
+    """
+    windows = []
+    cursor = day_start
+    # Skip the busy intervals that are over by the start of the day
+    for i in range(bisect_right(busy_ends, day_start), len(busy_times)):
+        busy_start, busy_end = busy_times[i]
+        if busy_start >= day_end:
+            break
+        if busy_start > cursor:
+            windows.append((cursor, busy_start))
+        cursor = busy_end
+        if cursor >= day_end:
+            return windows
+    windows.append((cursor, day_end))
+    return windows
+
+
+def _wall_clock(dt_str: str) -> str:
+    """Drop the UTC offset of an RFC3339 string, keeping its local wall-clock time."""
+    if dt_str[-1] == 'Z':
+        return dt_str[:-1]
+    if len(dt_str) > 19 and dt_str[-6] in '+-':
+        return dt_str[:-6]
+    return dt_str
+
+
+def _parse_busy_strings(pairs: List[Tuple[str, str]]) -> np.ndarray:
+    """
+    Parse (start, end) ISO strings into an (N, 2) datetime64 array.
+    
+    The whole list is parsed in one NumPy call; if any string is malformed, the
+    pairs are parsed one by one and the bad ones are skipped.
+    """
+    try:
+        return np.array(pairs, dtype=BUSY_DTYPE).reshape(-1, 2)
+    except ValueError:
+        pass
+    
+    parsed = []
+    for pair in pairs:
+        try:
+            parsed.append(np.array(pair, dtype=BUSY_DTYPE))
+        except ValueError as e:
+            print(f"Error parsing event times: {e}")
+    return np.array(parsed, dtype=BUSY_DTYPE).reshape(-1, 2)
+
+
+def merge_intervals(intervals: np.ndarray) -> np.ndarray:
+    """
+    Merge overlapping or touching intervals.
+    
+    Args:
+        intervals: (N, 2) datetime64 array of (start, end) rows in any order
+        
+    Returns:
+        (M, 2) datetime64 array of disjoint intervals sorted by start
+    """
+    if len(intervals) == 0:
+        return intervals
+    
+    intervals = intervals[np.argsort(intervals[:, 0], kind='stable')]
+    # An interval starts a new group unless it begins before everything so far has ended
+    running_end = np.maximum.accumulate(intervals[:, 1])
+    new_group = np.empty(len(intervals), dtype=bool)
+    new_group[0] = True
+    new_group[1:] = intervals[1:, 0] > running_end[:-1]
+    
+    first = np.flatnonzero(new_group)
+    last = np.append(first[1:] - 1, len(intervals) - 1)
+    return np.column_stack((intervals[first, 0], running_end[last]))
@@ -5,22 +5,24 @@ Simplified Google Calendar API Authentication Script
 
 import os
 import json
-import pickle
 from google_auth_oauthlib.flow import InstalledAppFlow
+from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 
 # Define the scopes
 SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
 
+# JSON token store shared with google_calendar.py
+TOKEN_FILE = 'token_credentials.json'
+
 def main():
     print("=== Google Calendar API Authentication Helper ===")
     print("\nSTEP 1: Checking for existing credentials...")
     
     creds = None
-    if os.path.exists('token.pickle'):
-        print("Found existing token.pickle, attempting to use it...")
-        with open('token.pickle', 'rb') as token:
-            creds = pickle.load(token)
+    if os.path.exists(TOKEN_FILE):
+        print(f"Found existing {TOKEN_FILE}, attempting to use it...")
+        creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
             
         if creds and creds.valid:
             print("✅ Existing credentials are valid!")
@@ -35,8 +37,6 @@ def main():
     print("   'This site can't be reached' or 'Connection refused'")
     print("   That's NORMAL! Look at THIS terminal for success message\n")
     
-    input("Press ENTER when you're ready to continue...")
-    
     print("\nSTEP 3: Creating OAuth flow...")
     try:
         # Use the credentials file
@@ -47,11 +47,11 @@ def main():
         creds = flow.run_local_server(port=8501)
         
         # Save the credentials for next time
-        with open('token.pickle', 'wb') as token:
-            pickle.dump(creds, token)
+        with open(TOKEN_FILE, 'w') as token:
+            token.write(creds.to_json())
         
         print("\n✅ SUCCESS! Authentication complete.")
-        print("📁 Credentials saved to 'token.pickle'")
+        print(f"📁 Credentials saved to '{TOKEN_FILE}'")
         print("\nYou can now run your calendar script.")
     
     except Exception as e:
@@ -5,8 +5,12 @@ This version focuses on improved prompting and better confidence score handling.
 """
 
 import os
+import re
+import asyncio
+import hashlib
 import logging
 import sqlite3
+import threading
 from typing import List, Tuple, Dict, Optional
 from dotenv import load_dotenv
 
@@ -31,6 +35,41 @@ except ImportError:
 # Database connection
 DB_PATH = "planner.db"
 
+# Classifier results by cache key (see _classification_cache_key), also persisted in
+# the classification_cache table so recurring events are only sent to the LLM once.
+# The table is loaded once per process; new results wait in _unsaved_cache_rows until
+# _save_classification_cache writes them. Classification runs on worker threads, so
+# both are guarded by _cache_lock.
+_classification_cache: Dict[str, Dict] = {}
+_unsaved_cache_rows: List[Tuple[str, str, float, str]] = []
+_cache_loaded = False
+_cache_lock = threading.Lock()
+_CACHE_TABLE_DDL = """
+    CREATE TABLE IF NOT EXISTS classification_cache
+    (key TEXT PRIMARY KEY, project TEXT, confidence REAL, reason TEXT)
+"""
+
+# Maximum number of classifier requests in flight in auto_classify_events
+CLASSIFY_CONCURRENCY = 8
+
+# First number in an LLM confidence answer such as "85", "85%" or "Confidence: 85.5"
+_CONFIDENCE_RE = re.compile(r'-?\d+(?:\.\d+)?')
+
+# Words of an event title or project name, for keyword matching
+_WORD_RE = re.compile(r'\w+')
+
+# Confidence of a title that is just a project's name: high, but not certain
+KEYWORD_MATCH_CONFIDENCE = 90
+
+def _parse_confidence(confidence_score) -> float:
+    """Extract a 0-100 confidence from the classifier output, defaulting to 0."""
+    match = _CONFIDENCE_RE.search(str(confidence_score))
+    if match is None:
+        logger.warning(f"Couldn't parse confidence score: {confidence_score}, defaulting to 0")
+        return 0
+    # Ensure confidence is in the right range
+    return max(0, min(100, float(match.group())))
+
 def init_dspy():
     """Initialize DSPy with OpenAI."""
     # Check for API key
@@ -72,7 +111,7 @@ def init_dspy():
             
         def forward(self, event_title, event_description, event_calendar, available_projects):
             # Add some guidance to make the model more decisive
-            if isinstance(available_projects, list):
+            if isinstance(available_projects, (list, tuple)):
                 projects_list = available_projects
             else:
                 # Handle case where projects might be passed as string
@@ -90,20 +129,7 @@ def init_dspy():
             )
             
             # Process the confidence score to ensure it's a number
-            try:
-                if isinstance(result.confidence_score, str):
-                    # Remove any % signs and convert to float
-                    confidence = result.confidence_score.strip('%').strip()
-                    confidence = float(confidence)
-                else:
-                    confidence = float(result.confidence_score)
-                
-                # Ensure confidence is in the right range
-                confidence = max(0, min(100, confidence))
-            except (ValueError, TypeError):
-                # Default to 0 if we couldn't parse the confidence
-                logger.warning(f"Couldn't parse confidence score: {result.confidence_score}, defaulting to 0")
-                confidence = 0
+            confidence = _parse_confidence(result.confidence_score)
             
             # Ensure the project choice is valid - must be in the list or 'unknown'
             if result.project_choice not in projects_list and result.project_choice != 'unknown':
@@ -127,9 +153,11 @@ def init_dspy():
     
     return EventClassifier()
 
-def get_projects_from_db() -> List[Tuple[int, str, str]]:
-    """Get all projects from the database."""
-    conn = sqlite3.connect(DB_PATH)
+def get_projects_from_db(conn: Optional[sqlite3.Connection] = None) -> List[Tuple[int, str, str]]:
+    """Get all projects from the database, reusing conn if given (it is left open)."""
+    owns_conn = conn is None
+    if owns_conn:
+        conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
     try:
@@ -144,13 +172,76 @@ def get_projects_from_db() -> List[Tuple[int, str, str]]:
         logger.error(f"Failed to fetch projects: {e}")
         return []
     finally:
-        conn.close()
+        if owns_conn:
+            conn.close()
+
+def _keyword_match(event_title: str, project_names: List[str]) -> Optional[str]:
+    """
+    Return the project whose name is the whole title ("work", "Family!"), ignoring case
+    and punctuation. A name that only appears in a longer title ("Personal trainer at
+    the gym") is left to the classifier.
+    """
+    title_words = _WORD_RE.findall((event_title or "").lower())
+    if not title_words:
+        return None
+    for name in project_names:
+        if _WORD_RE.findall(name.lower()) == title_words:
+            return name
+    return None
+
+def _classification_cache_key(event_title: str, event_description: str, event_calendar: str,
+                              project_names: List[str]) -> str:
+    """Hash the classifier inputs; the project list is included so new projects invalidate entries."""
+    text = "\x1f".join([event_title or "", event_description or "", event_calendar or "", *project_names])
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def _load_classification_cache(conn: sqlite3.Connection) -> None:
+    """Create the classification_cache table if needed and load it into memory (once per process)."""
+    global _cache_loaded
+    with _cache_lock:
+        if _cache_loaded:
+            return
+        try:
+            conn.execute(_CACHE_TABLE_DDL)
+            rows = conn.execute("SELECT key, project, confidence, reason FROM classification_cache").fetchall()
+        except Exception as e:
+            logger.error(f"Failed to read classification cache: {e}")
+            return
+        for key, project, confidence, reason in rows:
+            _classification_cache.setdefault(key, {'project': project, 'confidence': confidence, 'reason': reason})
+        _cache_loaded = True
+
+def _get_cached_classification(key: str) -> Optional[Dict]:
+    """Look up a classifier result in the in-memory cache."""
+    with _cache_lock:
+        return _classification_cache.get(key)
+
+def _store_cached_classification(key: str, result: Dict) -> None:
+    """Remember a classifier result in memory and queue it for _save_classification_cache."""
+    cached = {'project': result['project'], 'confidence': result['confidence'], 'reason': str(result['reason'])}
+    with _cache_lock:
+        _classification_cache[key] = cached
+        _unsaved_cache_rows.append((key, cached['project'], cached['confidence'], cached['reason']))
+
+def _save_classification_cache(conn: sqlite3.Connection) -> None:
+    """Write the queued classifier results to the classification_cache table (the caller commits)."""
+    with _cache_lock:
+        rows = list(_unsaved_cache_rows)
+        _unsaved_cache_rows.clear()
+    if not rows:
+        return
+    conn.execute(_CACHE_TABLE_DDL)
+    conn.executemany(
+        "INSERT OR REPLACE INTO classification_cache (key, project, confidence, reason) VALUES (?, ?, ?, ?)",
+        rows
+    )
 
 def classify_event(
     event_title: str,
     event_description: str = "",
     event_calendar: str = "",
-    classifier = None
+    classifier = None,
+    projects: Optional[List[Tuple[int, str, str]]] = None
 ) -> Dict:
     """
     Classify a calendar event into a project.
@@ -160,12 +251,19 @@ def classify_event(
         event_description: The description of the event (optional)
         event_calendar: The calendar ID or name (optional)
         classifier: An existing classifier instance (optional)
+        projects: (id, name, description) rows from get_projects_from_db (optional)
         
     Returns:
         Dict with keys: project_id, project_name, confidence, reason
     """
-    # Get projects from the database
-    projects = get_projects_from_db()
+    # Get projects from the database unless the caller already has them
+    if projects is None:
+        conn = sqlite3.connect(DB_PATH)
+        try:
+            _load_classification_cache(conn)
+            projects = get_projects_from_db(conn)
+        finally:
+            conn.close()
     if not projects:
         logger.warning("No projects found in the database, cannot classify event")
         return {
@@ -178,6 +276,27 @@ def classify_event(
     # Extract project names
     project_names = [p[1] for p in projects]
     
+    # Add some context for empty description
+    if not event_description:
+        event_description = "(No description provided)"
+    
+    # Events titled with just a project's name don't need the LLM
+    project_name = _keyword_match(event_title, project_names)
+    if project_name is not None:
+        logger.info(f"Classified event '{event_title}' by keyword as '{project_name}'")
+        return _classification_result({
+            'project': project_name,
+            'confidence': KEYWORD_MATCH_CONFIDENCE,
+            'reason': f"Title is the project name '{project_name}'"
+        }, projects)
+    
+    # Recurring events repeat the same inputs; reuse an earlier answer if there is one
+    cache_key = _classification_cache_key(event_title, event_description, event_calendar, project_names)
+    result = _get_cached_classification(cache_key)
+    if result is not None:
+        logger.info(f"Using cached classification for event: '{event_title}'")
+        return _classification_result(result, projects)
+    
     # Initialize DSPy if not provided
     if classifier is None:
         try:
@@ -191,10 +310,6 @@ def classify_event(
                 'reason': f'Error: {str(e)}'
             }
     
-    # Add some context for empty description
-    if not event_description:
-        event_description = "(No description provided)"
-    
     # Call the classifier
     try:
         logger.info(f"Classifying event: '{event_title}'")
@@ -204,21 +319,9 @@ def classify_event(
             event_calendar=event_calendar,
             available_projects=project_names
         )
+        _store_cached_classification(cache_key, result)
         
-        # Map the project name back to ID if it's not unknown
-        project_id = None
-        if result['project'] != 'unknown':
-            for p_id, p_name, _ in projects:
-                if p_name == result['project']:
-                    project_id = p_id
-                    break
-        
-        return {
-            'project_id': project_id,
-            'project_name': result['project'],
-            'confidence': result['confidence'],
-            'reason': result['reason']
-        }
+        return _classification_result(result, projects)
     except Exception as e:
         logger.error(f"Classification failed: {e}")
         return {
@@ -228,6 +331,43 @@ def classify_event(
             'reason': f'Error: {str(e)}'
         }
 
+def _classification_result(result: Dict, projects: List[Tuple[int, str, str]]) -> Dict:
+    """Turn a classifier result into the classify_event return value."""
+    # Map the project name back to ID if it's not unknown
+    project_id = None
+    if result['project'] != 'unknown':
+        for p_id, p_name, _ in projects:
+            if p_name == result['project']:
+                project_id = p_id
+                break
+    
+    return {
+        'project_id': project_id,
+        'project_name': result['project'],
+        'confidence': result['confidence'],
+        'reason': result['reason']
+    }
+
+async def _classify_one(sem: asyncio.Semaphore, event: Tuple, classifier, projects) -> Dict:
+    """Classify one events row in a worker thread, bounded by the semaphore."""
+    event_id, google_event_id, title, description, calendar_id = event
+    async with sem:
+        # DSPy calls are synchronous, so run them off the event loop
+        return await asyncio.to_thread(
+            classify_event,
+            event_title=title,
+            event_description=description or "",
+            event_calendar=calendar_id,
+            classifier=classifier,
+            projects=projects
+        )
+
+async def _classify_all(events: List[Tuple], classifier, projects) -> List:
+    """Classify events rows concurrently, returning results (or exceptions) in input order."""
+    sem = asyncio.Semaphore(CLASSIFY_CONCURRENCY)
+    tasks = [_classify_one(sem, event, classifier, projects) for event in events]
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
 def auto_classify_events(limit=10):
     """
     Automatically classify unclassified events in the database.
@@ -240,6 +380,8 @@ def auto_classify_events(limit=10):
     """
     # Connect to the database
     conn = sqlite3.connect(DB_PATH)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
     cursor = conn.cursor()
     
     try:
@@ -259,20 +401,22 @@ def auto_classify_events(limit=10):
         
         logger.info(f"Found {len(events)} unclassified events")
         
-        # Initialize the classifier once to reuse
+        # Initialize the classifier and load the projects and cached results once to reuse
         classifier = init_dspy()
+        projects = get_projects_from_db(conn)
+        _load_classification_cache(conn)
+        
+        # Classify all events concurrently; each call is an independent LLM request
+        classifications = asyncio.run(_classify_all(events, classifier, projects))
         
         results = []
-        for event in events:
+        updates = []
+        for event, result in zip(events, classifications):
             event_id, google_event_id, title, description, calendar_id = event
             
-            # Classify the event
-            result = classify_event(
-                event_title=title,
-                event_description=description or "",
-                event_calendar=calendar_id,
-                classifier=classifier
-            )
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to classify event {event_id}: {result}")
+                continue
             
             # Store the result
             results.append({
@@ -283,18 +427,23 @@ def auto_classify_events(limit=10):
                 'reason': result['reason']
             })
             
-            # Update the database if we have a project match
+            # Queue a database update if we have a project match
             if result['project_id'] is not None:
-                try:
-                    cursor.execute("""
-                        UPDATE events
-                        SET project_id = ?
-                        WHERE id = ?
-                    """, (result['project_id'], event_id))
-                    conn.commit()
-                    logger.info(f"Event '{title}' classified as '{result['project_name']}' with {result['confidence']}% confidence")
-                except Exception as e:
-                    logger.error(f"Failed to update event {event_id}: {e}")
+                updates.append((result['project_id'], event_id))
+                logger.info(f"Event '{title}' classified as '{result['project_name']}' with {result['confidence']}% confidence")
+        
+        # Apply all updates and new cache entries in a single transaction
+        try:
+            if updates:
+                cursor.executemany("""
+                    UPDATE events
+                    SET project_id = ?
+                    WHERE id = ?
+                """, updates)
+            _save_classification_cache(conn)
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to save {len(updates)} classified events: {e}")
         
         return results
     except Exception as e:
@@ -382,6 +531,16 @@ if __name__ == "__main__":
         print(f"Reason: {result['reason']}")
         print("-" * 50)
     
+    # Persist the new cache entries from the sample events
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        with conn:
+            _save_classification_cache(conn)
+    except Exception as e:
+        print(f"Error saving classification cache: {e}")
+    finally:
+        conn.close()
+    
     # Now run auto-classification on actual database events
     print("\nRunning auto-classification on database events...")
     auto_results = auto_classify_events(limit=5)
@@ -2,6 +2,11 @@
 import database
 import json
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib json module
+    orjson = None
+
 db = database.get_db_session()
 events = db.query(database.EventModel).all()
 print(f"Found {len(events)} events:")
@@ -13,8 +18,11 @@ for event in events:
     # For the second event (Pydantic event), print the full raw data
     if event.event_id == "test456":
         print("\nFull raw data for test456:")
-        raw_data = json.loads(event.raw_event_data)
-        print(json.dumps(raw_data, indent=2))
+        if orjson is not None:
+            print(orjson.dumps(orjson.loads(event.raw_event_data), option=orjson.OPT_INDENT_2).decode())
+        else:
+            raw_data = json.loads(event.raw_event_data)
+            print(json.dumps(raw_data, indent=2))
     else:
         print(f"Raw data: {event.raw_event_data[:200]}...")  # Show beginning of raw data
     
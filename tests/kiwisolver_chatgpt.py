@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import kiwisolver as kiwi
 
@@ -19,18 +20,12 @@ projects_data = [
 ]
 projects_df = pd.DataFrame(projects_data)
 
-# Create "focus blocks" of 1 hour each for these projects.
-focus_blocks = []
-for idx, row in projects_df.iterrows():
-    project = row["project"]
-    needed = int(row["total_hours_needed"])
-    for i in range(needed):
-        focus_blocks.append({
-            "block_name": f"{project}_Block_{i+1}",
-            "project": project,
-            "priority": row["priority"]
-        })
-focus_blocks_df = pd.DataFrame(focus_blocks)
+# Create "focus blocks" of 1 hour each for these projects: repeat each project row
+# once per needed hour and number the copies within each project.
+counts = projects_df["total_hours_needed"].to_numpy(dtype=np.int64)
+focus_blocks_df = projects_df.loc[projects_df.index.repeat(counts), ["project", "priority"]].reset_index(drop=True)
+block_numbers = (focus_blocks_df.groupby("project").cumcount() + 1).astype(str)
+focus_blocks_df.insert(0, "block_name", focus_blocks_df["project"] + "_Block_" + block_numbers)
 print(f"Input data for the focus blocks: {focus_blocks_df}")
 
 # ------------------------------------------------------------------------------
@@ -38,41 +33,40 @@ print(f"Input data for the focus blocks: {focus_blocks_df}")
 # ------------------------------------------------------------------------------
 solver = kiwi.Solver()
 
-# Dictionary to store Kiwi Variables for each block.
-start_vars = {}
+# Kiwi Variables for each block, in focus_blocks_df row order.
+block_vars = []
 
 WORKDAY_START = 9.0
 WORKDAY_END   = 21.0
 BLOCK_DURATION = 1.0
 
+# Avoid overlap with fixed events:
+# Push all new blocks to start after the last fixed event's end. The bound is the
+# same for every block, so fold it into the workday start instead of adding it
+# as a separate constraint per block.
+latest_end_of_fixed = max(fixed_events_df["end"])
+earliest_start = max(WORKDAY_START, latest_end_of_fixed)
+
 # Create variables and basic time constraints for each block.
-for _, row in focus_blocks_df.iterrows():
-    block_name = row["block_name"]
+for block_name, priority in zip(focus_blocks_df["block_name"].to_numpy(), focus_blocks_df["priority"].to_numpy()):
     var = kiwi.Variable(block_name)
     
-    # Required constraints: WORKDAY_START <= var <= WORKDAY_END - BLOCK_DURATION
-    solver.addConstraint(var >= WORKDAY_START)
+    # Required constraints: earliest_start <= var <= WORKDAY_END - BLOCK_DURATION
+    solver.addConstraint(var >= earliest_start)
     solver.addConstraint(var <= WORKDAY_END - BLOCK_DURATION)
     
     # For high priority, we add an edit variable and suggest a value (soft constraint)
-    if row["priority"] == "high":
+    if priority == "high":
         solver.addEditVariable(var, kiwi.strength.strong)
         solver.suggestValue(var, WORKDAY_START)
     
-    start_vars[block_name] = var
-
-# Impose ordering: each block (sorted by name) starts at least 1 hour after the previous one ends.
-sorted_block_names = sorted(start_vars.keys())
-for i in range(len(sorted_block_names) - 1):
-    current_block = sorted_block_names[i]
-    next_block    = sorted_block_names[i+1]
-    solver.addConstraint(start_vars[next_block] - start_vars[current_block] >= BLOCK_DURATION)
+    block_vars.append(var)
 
-# Avoid overlap with fixed events:
-# Push all new blocks to start after the last fixed event's end.
-latest_end_of_fixed = max(fixed_events_df["end"])
-for var in start_vars.values():
-    solver.addConstraint(var >= latest_end_of_fixed)
+# Impose ordering: each block starts at least 1 hour after the previous one ends.
+# focus_blocks_df already lists the blocks in project order and then block number
+# order; sorting the names as strings would put "_Block_10" before "_Block_2".
+for current_var, next_var in zip(block_vars, block_vars[1:]):
+    solver.addConstraint(next_var - current_var >= BLOCK_DURATION)
 
 # ------------------------------------------------------------------------------
 # SOLVE & PRINT RESULTS
@@ -80,23 +74,11 @@ for var in start_vars.values():
 solver.updateVariables()
 
 # Collect the schedule (start/end) for each block.
-schedule_rows = []
-for _, row in focus_blocks_df.iterrows():
-    block_name = row["block_name"]
-    project    = row["project"]
-    priority   = row["priority"]
-    start_time = start_vars[block_name].value()
-    end_time   = start_time + BLOCK_DURATION
-    
-    schedule_rows.append({
-        "block_name": block_name,
-        "project": project,
-        "priority": priority,
-        "start": round(start_time, 2),
-        "end": round(end_time, 2)
-    })
-
-schedule_df = pd.DataFrame(schedule_rows)
+start_times = np.fromiter((var.value() for var in block_vars), dtype=np.float64, count=len(block_vars))
+schedule_df = focus_blocks_df.assign(
+    start=start_times.round(2),
+    end=(start_times + BLOCK_DURATION).round(2)
+)
 
 print("\n--- Optimized Focus Blocks ---")
 print(schedule_df)
@@ -4,6 +4,8 @@ Sudoku solver using IBM CPLEX Optimizer.
 This demonstrates how to solve constraint satisfaction problems with CPLEX.
 """
 
+from math import isqrt
+
 import docplex.mp.model as cplex_model
 import numpy as np
 
@@ -26,37 +28,33 @@ def solve_quadratic_equation_with_cplex():
     # Create variables
     x = model.continuous_var(lb=-100, ub=100, name="x")
     
-    # We can formulate this as: "x = 0 OR x = -4" using binary variables
-    is_zero = model.binary_var(name="is_zero")
+    # We can formulate this as: "x = 0 OR x = -4" with a single binary variable:
+    # x is -4 when it is set and 0 otherwise, a plain linear equation that presolve
+    # can substitute directly (no indicator constraints needed)
     is_neg_four = model.binary_var(name="is_neg_four")
-    
-    # Add indicator constraints
-    model.add_indicator(is_zero, x == 0)
-    model.add_indicator(is_neg_four, x == -4)
-    
-    # Ensure exactly one solution is picked
-    model.add_constraint(is_zero + is_neg_four == 1)
-    
-    # Solve the model
-    solution = model.solve()
-    
-    # Print the solution
-    if solution:
+    model.add_constraint(x == -4 * is_neg_four)
+    
+    # Collect every feasible assignment in a single populate run instead of
+    # re-solving with the first answer excluded
+    model.parameters.mip.pool.intensity = 4
+    model.parameters.mip.limits.populate = 10
+    pool = model.populate_solution_pool()
+    solutions = list(pool) if pool else []
+    
+    # Print the solutions
+    if solutions:
+        solution = solutions[0]
         print(f"Solution found: x = {solution[x]}")
         
-        # Try to find the other solution by adding a constraint
         print("\nFinding alternative solution...")
-        if solution[x] == 0:
-            model.add_constraint(x != 0)
-        else:
-            model.add_constraint(x != -4)
-            
-        alt_solution = model.solve()
-        if alt_solution:
-            print(f"Alternative solution found: x = {alt_solution[x]}")
+        alt_values = sorted({sol[x] for sol in solutions} - {solution[x]})
+        if alt_values:
+            for value in alt_values:
+                print(f"Alternative solution found: x = {value}")
         else:
             print("No alternative solution found")
     else:
+        solution = None
         print("No solution found")
     
     return solution
@@ -73,7 +71,7 @@ def solve_sudoku_with_cplex(puzzle):
         A 2D array with the solved Sudoku, or None if no solution exists.
     """
     n = len(puzzle)  # Size of the grid (9 for standard Sudoku)
-    subgrid_size = int(np.sqrt(n))  # Size of subgrids (3 for standard Sudoku)
+    subgrid_size = isqrt(n)  # Size of subgrids (3 for standard Sudoku)
     
     print(f"\n=== Solving {n}x{n} Sudoku with CPLEX ===")
     print("Initial puzzle:")
@@ -82,65 +80,54 @@ def solve_sudoku_with_cplex(puzzle):
     # Create a CPLEX model
     model = cplex_model.Model(name=f"sudoku_{n}x{n}")
     
-    # Create variables for each cell
-    # grid[i,j,v] = 1 means cell (i,j) has value v
-    grid = {}
-    for i in range(n):
-        for j in range(n):
-            for v in range(1, n+1):
-                grid[i, j, v] = model.binary_var(name=f"grid_{i}_{j}_{v}")
+    # Create variables for each cell in one call
+    # grid[i,j,k] = 1 means cell (i,j) has value k+1
+    grid = np.array(model.binary_var_list(n * n * n, name="grid"), dtype=object).reshape(n, n, n)
     
-    # Initial values constraint
+    # Initial values: fix the given cells' variables through their bounds, which
+    # presolve uses directly, rather than through extra constraint rows. The given
+    # value's variable is fixed to 1 and the cell's other values to 0.
     for i in range(n):
         for j in range(n):
             if puzzle[i][j] > 0:
-                # If the initial grid has a value, set the corresponding variable to 1
-                model.add_constraint(grid[i, j, puzzle[i][j]] == 1)
+                for k in range(n):
+                    if k == puzzle[i][j] - 1:
+                        grid[i, j, k].lb = 1
+                    else:
+                        grid[i, j, k].ub = 0
     
     # Each cell has exactly one value
-    for i in range(n):
-        for j in range(n):
-            model.add_constraint(
-                model.sum(grid[i, j, v] for v in range(1, n+1)) == 1
-            )
+    constraints = [model.sum_vars(grid[i, j, :].tolist()) == 1 for i in range(n) for j in range(n)]
     
     # Each row has each value exactly once
-    for i in range(n):
-        for v in range(1, n+1):
-            model.add_constraint(
-                model.sum(grid[i, j, v] for j in range(n)) == 1
-            )
+    constraints += [model.sum_vars(grid[i, :, k].tolist()) == 1 for i in range(n) for k in range(n)]
     
     # Each column has each value exactly once
-    for j in range(n):
-        for v in range(1, n+1):
-            model.add_constraint(
-                model.sum(grid[i, j, v] for i in range(n)) == 1
-            )
-    
-    # Each subgrid has each value exactly once
-    for box_i in range(subgrid_size):
-        for box_j in range(subgrid_size):
-            for v in range(1, n+1):
-                model.add_constraint(
-                    model.sum(
-                        grid[box_i*subgrid_size + i, box_j*subgrid_size + j, v] 
-                        for i in range(subgrid_size) for j in range(subgrid_size)
-                    ) == 1
-                )
+    constraints += [model.sum_vars(grid[:, j, k].tolist()) == 1 for j in range(n) for k in range(n)]
+    
+    # Each subgrid has each value exactly once: regroup the grid as
+    # (box row, box column, value, cells of the box)
+    boxes = grid.reshape(subgrid_size, subgrid_size, subgrid_size, subgrid_size, n)
+    boxes = boxes.transpose(0, 2, 4, 1, 3).reshape(subgrid_size, subgrid_size, n, n)
+    constraints += [
+        model.sum_vars(boxes[box_i, box_j, k].tolist()) == 1
+        for box_i in range(subgrid_size) for box_j in range(subgrid_size) for k in range(n)
+    ]
+    
+    # Submit all constraints in one batch
+    model.add_constraints(constraints)
+    
+    # Any feasible assignment is the answer, so favour finding one over proving optimality
+    model.parameters.emphasis.mip = 1
     
     # Solve the model
     solution = model.solve()
     
     # Process the solution
     if solution:
-        # Create a grid to hold the solution
-        solution_grid = [[0 for _ in range(n)] for _ in range(n)]
-        for i in range(n):
-            for j in range(n):
-                for v in range(1, n+1):
-                    if solution[grid[i, j, v]] > 0.5:
-                        solution_grid[i][j] = v
+        # Each cell's value is the index of its variable set to 1
+        values = np.array(solution.get_values(grid.ravel().tolist())).reshape(n, n, n)
+        solution_grid = (values.argmax(axis=2) + 1).tolist()
         
         print("\nSolution found:")
         print_sudoku(solution_grid)
@@ -152,29 +139,20 @@ def solve_sudoku_with_cplex(puzzle):
 def print_sudoku(grid):
     """Print a Sudoku grid in a readable format."""
     n = len(grid)
-    subgrid_size = int(np.sqrt(n))
+    subgrid_size = isqrt(n)
     
-    # Print horizontal line
-    def print_h_line():
-        line = "+"
-        for i in range(subgrid_size):
-            line += "-" * (subgrid_size * 2 + 1) + "+"
-        print(line)
+    # Horizontal line
+    h_line = "+" + ("-" * (subgrid_size * 2 + 1) + "+") * subgrid_size
     
-    for i in range(n):
+    for i, row in enumerate(grid):
         if i % subgrid_size == 0:
-            print_h_line()
+            print(h_line)
         
-        line = "|"
-        for j in range(n):
-            if j % subgrid_size == 0 and j > 0:
-                line += "|"
-            value = grid[i][j]
-            line += " " + (str(value) if value > 0 else " ")
-        line += " |"
-        print(line)
-    
-    print_h_line()
+        cells = [" " + (str(value) if value > 0 else " ") for value in row]
+        boxes = ["".join(cells[j:j + subgrid_size]) for j in range(0, n, subgrid_size)]
+        print("|" + "|".join(boxes) + " |")
+    
+    print(h_line)
 
 if __name__ == "__main__":
     # First solve the quadratic equation
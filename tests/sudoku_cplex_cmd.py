@@ -5,12 +5,22 @@ This approach uses subprocess to call MiniZinc directly with the appropriate fla
 """
 
 import subprocess
-import tempfile
 import os
 
 # Path to CPLEX shared library
 CPLEX_DLL_PATH = "/Volumes/vlexar/Applications/CPLEX_Studio2211/cplex/bin/arm64_osx/libcplex2211.dylib"
 
+# MiniZinc model for a*x^2 + b*x = c
+QUADRATIC_MODEL = """
+var -100..100: x;
+int: a = 1;
+int: b = 4;
+int: c = 0;
+constraint a*(x*x) + b*x = c;
+solve satisfy;
+output ["x = ", show(x), "\\n"];
+"""
+
 def solve_with_minizinc_cplex():
     """
     Solve a simple quadratic equation using MiniZinc with CPLEX.
@@ -22,45 +32,39 @@ def solve_with_minizinc_cplex():
         print(f"Error: CPLEX shared library not found at: {CPLEX_DLL_PATH}")
         return False
     
-    # Create a temporary MiniZinc model file
-    with tempfile.NamedTemporaryFile(suffix='.mzn', delete=False) as model_file:
-        model_file.write(b"""
-var -100..100: x;
-int: a = 1;
-int: b = 4;
-int: c = 0;
-constraint a*(x*x) + b*x = c;
-solve satisfy;
-output ["x = ", show(x), "\\n"];
-""")
-        model_path = model_file.name
-    
     try:
-        # Construct the MiniZinc command with CPLEX
+        # Construct the MiniZinc command with CPLEX; the model is piped in on stdin
         cmd = [
             "minizinc",
             "--solver", "cplex",
             "--cplex-dll", CPLEX_DLL_PATH,
-            model_path
+            "--input-from-stdin"
         ]
         
         print(f"Running command: {' '.join(cmd)}")
         
-        # Run the command
-        result = subprocess.run(
+        # Run the command, printing its output line by line as MiniZinc produces it.
+        # stderr (CPLEX logs can be long) goes into the same pipe, so neither stream
+        # can fill up and block the solver while the other is being read.
+        with subprocess.Popen(
             cmd,
-            capture_output=True,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            check=False
-        )
-        
-        # Print the output
-        print("\nCommand output:")
-        print(result.stdout)
+            bufsize=1
+        ) as process:
+            process.stdin.write(QUADRATIC_MODEL)
+            process.stdin.close()
+            
+            print("\nCommand output:")
+            for line in process.stdout:
+                print(line, end="")
+            
+            returncode = process.wait()
         
-        if result.returncode != 0:
-            print(f"Error (return code {result.returncode}):")
-            print(result.stderr)
+        if returncode != 0:
+            print(f"Error (return code {returncode}), see the output above")
             return False
         
         return True
@@ -68,10 +72,6 @@ output ["x = ", show(x), "\\n"];
     except Exception as e:
         print(f"Error: {e}")
         return False
-    
-    finally:
-        # Clean up the temporary file
-        os.unlink(model_path)
 
 def solve_with_docplex():
     """
@@ -91,34 +91,29 @@ def solve_with_docplex():
         # Create variables
         x = cpx.continuous_var(lb=-100, ub=100, name="x")
         
-        # We can formulate this as: "x = 0 OR x = -4" using binary variables
-        is_zero = cpx.binary_var(name="is_zero")
+        # We can formulate this as: "x = 0 OR x = -4" with a single binary variable:
+        # x is -4 when it is set and 0 otherwise, a plain linear equation that presolve
+        # can substitute directly (no indicator constraints needed)
         is_neg_four = cpx.binary_var(name="is_neg_four")
+        cpx.add_constraint(x == -4 * is_neg_four)
         
-        # Add indicator constraints
-        cpx.add_indicator(is_zero, x == 0)
-        cpx.add_indicator(is_neg_four, x == -4)
-        
-        # Ensure exactly one solution is picked
-        cpx.add_constraint(is_zero + is_neg_four == 1)
+        # Collect every feasible assignment in a single populate run instead of
+        # re-solving with the first answer excluded
+        cpx.parameters.mip.pool.intensity = 4
+        cpx.parameters.mip.limits.populate = 10
+        pool = cpx.populate_solution_pool()
+        solutions = list(pool) if pool else []
         
-        # Solve the model
-        solution = cpx.solve()
-        
-        # Print the solution
-        if solution:
+        # Print the solutions
+        if solutions:
+            solution = solutions[0]
             print(f"Solution found: x = {solution[x]}")
             
-            # Try to find the other solution by adding a constraint
             print("\nFinding alternative solution...")
-            if solution[x] == 0:
-                cpx.add_constraint(x != 0)
-            else:
-                cpx.add_constraint(x != -4)
-                
-            alt_solution = cpx.solve()
-            if alt_solution:
-                print(f"Alternative solution found: x = {alt_solution[x]}")
+            alt_values = sorted({sol[x] for sol in solutions} - {solution[x]})
+            if alt_values:
+                for value in alt_values:
+                    print(f"Alternative solution found: x = {value}")
             else:
                 print("No alternative solution found")
                 
@@ -5,25 +5,95 @@ Tests for the classification module.
 
 import os
 import sqlite3
+import functools
 import logging
-import random
+import shutil
+import tempfile
 from datetime import datetime, timedelta
 import sys
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, event as sqlalchemy_event
 
 # Add the parent directory to the path so we can import modules from there
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import the modules we want to test
+# classification pulls in DSPy, MLflow and Streamlit, so it is imported inside the
+# functions that use it to keep test collection fast
 import database
-import classification
+from models import CalendarEvent
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Seed data: (name, estimated_hours, priority, description) projects and
+# (title, description, project name, start time) events
+TEST_PROJECTS = [
+    ("Work", 40, 1, "Work-related activities"),
+    ("Health", 5, 2, "Health and fitness activities"),
+    ("Learning", 10, 3, "Learning and education activities"),
+    ("Personal", 5, 4, "Personal activities"),
+    ("Family", 10, 5, "Family-related activities")
+]
+TEST_EVENTS = [
+    ("Team Meeting", "Weekly team sync with engineering team", "Work", "2024-03-20T10:00:00"),
+    ("Dentist Appointment", "Routine checkup with Dr. Smith", "Health", "2024-03-21T14:00:00"),
+    ("Python Course", "Advanced Python programming webinar", "Learning", "2024-03-22T19:00:00"),
+    ("Grocery Shopping", "Buy weekly groceries from Whole Foods", "Personal", "2024-03-23T09:00:00"),
+    ("Family Dinner", "Dinner with parents at their house", "Family", "2024-03-24T18:00:00")
+]
+_INSERT_PROJECT = "INSERT INTO projects(name,estimated_hours,priority,description) VALUES (?,?,?,?)"
+_INSERT_EVENT = "INSERT INTO events(title,description,start_time,end_time,project_id,calendar_id) VALUES (?,?,?,?,?,?)"
+
+@functools.lru_cache(maxsize=1)
+def _configured_lm():
+    """Configure DSPy once per process and share the LM between tests."""
+    import classification
+    return classification.configure_dspy()
+
+# Original database settings, restored by tearDownModule
+_saved_database = None
+_test_db_dir = None
+
+def setUpModule():
+    """Point database (and so classification) at a throwaway SQLite file in a temp directory."""
+    global _saved_database, _test_db_dir
+    _saved_database = (database.DB_PATH, database.engine)
+    _test_db_dir = tempfile.mkdtemp(prefix="calendar-test-")
+    
+    database.DB_PATH = os.path.join(_test_db_dir, "planner.db")
+    database.engine = create_engine(f"sqlite:///{database.DB_PATH}", connect_args={"check_same_thread": False})
+    sqlalchemy_event.listen(database.engine, "connect", database._set_sqlite_pragmas)
+    database.SessionLocal.configure(bind=database.engine)
+
+def tearDownModule():
+    """Restore the real database settings and delete the temp database."""
+    database.engine.dispose()
+    database.DB_PATH, database.engine = _saved_database
+    database.SessionLocal.configure(bind=database.engine)
+    shutil.rmtree(_test_db_dir, ignore_errors=True)
+
+def _open_fast_conn() -> sqlite3.Connection:
+    """
+    Open the test database. With CALENDAR_TEST_FAST_SQLITE=1 the connection trades
+    durability for speed (no fsyncs, journal kept in memory), which is fine for
+    disposable test data.
+    """
+    conn = sqlite3.connect(database.DB_PATH)
+    if os.getenv("CALENDAR_TEST_FAST_SQLITE") == "1":
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA journal_mode=MEMORY")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
+    return conn
+
 def test_classification_system():
     """Test the classification system with sample events."""
+    import classification
+    
     logger.info("===== STARTING CLASSIFICATION SYSTEM TEST =====")
     
     # 1. Initialize database
@@ -31,66 +101,45 @@ def test_classification_system():
     classification.init_db()
     
     # 2. Create test projects if they don't exist
-    conn = sqlite3.connect(database.DB_PATH)
+    conn = _open_fast_conn()
     cursor = conn.cursor()
     
-    test_projects = [
-        ("Work", 40, 1, "Work-related activities"),
-        ("Health", 5, 2, "Health and fitness activities"),
-        ("Learning", 10, 3, "Learning and education activities"),
-        ("Personal", 5, 4, "Personal activities"),
-        ("Family", 10, 5, "Family-related activities")
-    ]
-    
-    for name, hours, priority, desc in test_projects:
-        cursor.execute("SELECT id FROM projects WHERE name = ?", (name,))
-        if not cursor.fetchone():
-            cursor.execute("""
-                INSERT INTO projects (name, estimated_hours, priority, description)
-                VALUES (?, ?, ?, ?)
-            """, (name, hours, priority, desc))
-            logger.info(f"Created test project: {name}")
+    # Insert the missing projects in one transaction
+    with conn:
+        cursor.execute("SELECT name FROM projects")
+        existing_names = {row[0] for row in cursor.fetchall()}
+        new_projects = [project for project in TEST_PROJECTS if project[0] not in existing_names]
+        cursor.executemany(_INSERT_PROJECT, new_projects)
+    for name, _, _, _ in new_projects:
+        logger.info(f"Created test project: {name}")
     
-    conn.commit()
+    # Look up all project IDs at once, for the seed events and the results log
+    cursor.execute("SELECT name, id FROM projects")
+    project_ids_by_name = dict(cursor.fetchall())
     
     # 3. Create test events if none exist
     cursor.execute("SELECT COUNT(*) FROM events")
     if cursor.fetchone()[0] == 0:
         logger.info("No events found, creating test events")
-        test_events = [
-            ("Team Meeting", "Weekly team sync with engineering team", "Work", "2024-03-20T10:00:00"),
-            ("Dentist Appointment", "Routine checkup with Dr. Smith", "Health", "2024-03-21T14:00:00"),
-            ("Python Course", "Advanced Python programming webinar", "Learning", "2024-03-22T19:00:00"),
-            ("Grocery Shopping", "Buy weekly groceries from Whole Foods", "Personal", "2024-03-23T09:00:00"),
-            ("Family Dinner", "Dinner with parents at their house", "Family", "2024-03-24T18:00:00")
-        ]
-        
-        # Insert test events
-        for title, desc, project_name, start_time in test_events:
-            # Get project ID
-            cursor.execute("SELECT id FROM projects WHERE name = ?", (project_name,))
-            project_id = cursor.fetchone()[0]
-            
-            # Create event
+        # Insert test events in one transaction, each lasting an hour
+        event_rows = []
+        for title, desc, project_name, start_time in TEST_EVENTS:
             start_dt = datetime.fromisoformat(start_time)
             end_time = start_dt + timedelta(hours=1)
-            
-            cursor.execute("""
-                INSERT INTO events 
-                (title, description, start_time, end_time, project_id, calendar_id) 
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                title, 
-                desc, 
-                start_dt.isoformat(), 
-                end_time.isoformat(), 
-                project_id,
+            event_rows.append((
+                title,
+                desc,
+                start_dt.isoformat(),
+                end_time.isoformat(),
+                project_ids_by_name[project_name],
                 "test-calendar@example.com"
             ))
-            
-            logger.info(f"Created test event: {title} (Project: {project_name})")
         
-        conn.commit()
+        with conn:
+            cursor.executemany(_INSERT_EVENT, event_rows)
+        
+        for title, _, project_name, _ in TEST_EVENTS:
+            logger.info(f"Created test event: {title} (Project: {project_name})")
     
     # 4. Test classification with new events
     logger.info("Testing classification with new events...")
@@ -103,22 +152,35 @@ def test_classification_system():
     ]
     
     # Configure DSPy first
-    lm = classification.configure_dspy()
+    lm = _configured_lm()
     if not lm:
         logger.error("Failed to configure DSPy. Test cannot continue.")
         return
     
-    for test_event, start_time in test_classifications:
-        project_id, confidence = classification.classify_event(
-            test_event,
-            event_start_time=start_time,
-            event_calendar="test-calendar@example.com",
-            lm=lm
-        )
+    project_names_by_id = {project_id: name for name, project_id in project_ids_by_name.items()}
+    
+    # Classify the probe events concurrently: each one is an independent LM request
+    probe_events = [
+        CalendarEvent.from_google_dict({
+            'id': f"probe-{i}",
+            'summary': test_event,
+            'start': {'dateTime': start_time},
+            'end': {'dateTime': (datetime.fromisoformat(start_time) + timedelta(hours=1)).isoformat()}
+        }, calendar_id="test-calendar@example.com")
+        for i, (test_event, start_time) in enumerate(test_classifications)
+    ]
+    project_ids, project_names = classification.get_project_data()
+    with ThreadPoolExecutor(max_workers=len(probe_events)) as executor:
+        results = list(executor.map(
+            lambda event: classification.classify_event(event, project_names, project_ids, lm=lm),
+            probe_events
+        ))
+    
+    for probe_event, (project_id, confidence) in zip(probe_events, results):
+        test_event = probe_event.summary
         
         if project_id:
-            cursor.execute("SELECT name FROM projects WHERE id = ?", (project_id,))
-            project_name = cursor.fetchone()[0]
+            project_name = project_names_by_id[project_id]
             logger.info(f"Classified '{test_event}' as '{project_name}' with {confidence:.1f}% confidence")
         else:
             logger.info(f"Could not classify '{test_event}' with sufficient confidence ({confidence:.1f}%)")
@@ -132,6 +194,8 @@ def test_mlflow():
     """
     Test that MLflow is configured and autologging is enabled.
     """
+    import classification
+    
     logger.info("Testing MLflow configuration...")
     
     try:
@@ -147,7 +211,7 @@ def test_mlflow():
             logger.warning(f"Experiment '{classification.EXPERIMENT_NAME}' not found. It will be created when needed.")
         
         # Make a simple prediction to test autologging
-        lm = classification.configure_dspy()
+        lm = _configured_lm()
         if lm:
             test_result = classification.classify_event("Test event for MLflow", lm=lm)
             logger.info(f"Test prediction completed: {test_result}")
@@ -163,10 +227,12 @@ def create_test_experiment():
     """
     Create a simple test to verify MLflow autologging works.
     """
+    import classification
+    
     logger.info("Creating test experiment...")
     
     # Configure DSPy
-    lm = classification.configure_dspy()
+    lm = _configured_lm()
     if not lm:
         logger.error("Failed to configure DSPy. Test cannot continue.")
         return
@@ -187,14 +253,18 @@ def create_test_experiment():
 class TestClassification(unittest.TestCase):
     """Unit tests for the classification module."""
     
-    def setUp(self):
-        """Set up test resources."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up test resources once for all tests in the class."""
         # Configure DSPy for testing
-        self.lm = classification.configure_dspy()
-        self.assertIsNotNone(self.lm, "Failed to configure DSPy")
+        cls.lm = _configured_lm()
+        if cls.lm is None:
+            raise AssertionError("Failed to configure DSPy")
     
     def test_batch_classification(self):
         """Test batch classification functionality."""
+        import classification
+        
         # Create test data
         test_events = [
             {'id': 1, 'title': 'Team Meeting about Website Design', 'description': 'Weekly sync with the design team'},
@@ -216,4 +286,8 @@ class TestClassification(unittest.TestCase):
 
 if __name__ == "__main__":
     # If run directly, execute the test system
-    test_classification_system() 
\ No newline at end of file
+    setUpModule()
+    try:
+        test_classification_system()
+    finally:
+        tearDownModule() 
\ No newline at end of file
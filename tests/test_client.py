@@ -1,25 +1,27 @@
 from googleapiclient.discovery import build
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
 import os.path
-import pickle
 import datetime
 import sys
 
-# If modifying these SCOPES, delete the file token.pickle.
+# If modifying these SCOPES, delete the file token_credentials.json.
 SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
 
+# JSON token store shared with google_calendar.py
+TOKEN_FILE = 'token_credentials.json'
+
 def main():
     """Shows basic usage of the Google Calendar API.
     Lists the next 10 events on the user's calendar.
     """
     creds = None
-    # The file token.pickle stores the user's access and refresh tokens, and is
-    # created automatically when the authorization flow completes for the first
-    # time.
-    if os.path.exists('token.pickle'):
-        with open('token.pickle', 'rb') as token:
-            creds = pickle.load(token)
+    # The file token_credentials.json stores the user's access and refresh tokens,
+    # and is created automatically when the authorization flow completes for the
+    # first time.
+    if os.path.exists(TOKEN_FILE):
+        creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
     # If there are no (valid) credentials available, let the user log in.
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
@@ -46,17 +48,19 @@ def main():
                 sys.exit(1)
                 
         # Save the credentials for the next run
-        with open('token.pickle', 'wb') as token:
-            pickle.dump(creds, token)
+        with open(TOKEN_FILE, 'w') as token:
+            token.write(creds.to_json())
 
-    service = build('calendar', 'v3', credentials=creds)
+    service = build('calendar', 'v3', credentials=creds, static_discovery=True, cache_discovery=False)
 
     # Call the Calendar API
-    now = datetime.datetime.utcnow().isoformat() + 'Z' # 'Z' indicates UTC time
+    now = datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ') # 'Z' indicates UTC time
     print('Getting the upcoming 10 events')
-    events_result = service.events().list(calendar_id='primary', timeMin=now,
+    # Only ask for the fields printed below
+    events_result = service.events().list(calendarId='primary', timeMin=now,
                                           maxResults=10, singleEvents=True,
-                                          orderBy='startTime').execute()
+                                          orderBy='startTime',
+                                          fields='items(summary,start(dateTime,date))').execute()
     events = events_result.get('items', [])
 
     if not events:
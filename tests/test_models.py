@@ -7,7 +7,7 @@ import os
 import sys
 import json
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 import unittest
 
 # Add the parent directory to the path so we can import modules from there
@@ -52,13 +52,22 @@ class TestModels(unittest.TestCase):
     
     def test_time_of_day(self):
         """Test the get_time_of_day function."""
-        morning = datetime.now().replace(hour=8, minute=0)
-        afternoon = datetime.now().replace(hour=14, minute=0)
-        evening = datetime.now().replace(hour=20, minute=0)
+        now = datetime.now()
+        morning = now.replace(hour=8, minute=0)
+        afternoon = now.replace(hour=14, minute=0)
+        evening = now.replace(hour=20, minute=0)
         
         self.assertEqual(get_time_of_day(morning), TimeOfDay.MORNING)
         self.assertEqual(get_time_of_day(afternoon), TimeOfDay.AFTERNOON)
         self.assertEqual(get_time_of_day(evening), TimeOfDay.EVENING)
+        
+        # Bucket boundaries
+        expected = {0: TimeOfDay.EVENING, 4: TimeOfDay.EVENING, 5: TimeOfDay.MORNING,
+                    11: TimeOfDay.MORNING, 12: TimeOfDay.AFTERNOON, 16: TimeOfDay.AFTERNOON,
+                    17: TimeOfDay.EVENING, 23: TimeOfDay.EVENING}
+        for hour, time_of_day in expected.items():
+            self.assertEqual(get_time_of_day(morning.replace(hour=hour)), time_of_day)
+        self.assertEqual(get_time_of_day(None), TimeOfDay.UNKNOWN)
     
     def test_event_attendee(self):
         """Test the EventAttendee model."""
@@ -139,22 +148,19 @@ class TestModels(unittest.TestCase):
     
     def test_event_serialization(self):
         """Test that events can be serialized and deserialized correctly."""
+        now = datetime.now()
         # Create a test event
         original_event = CalendarEvent(
             id="test-event-123",
             summary="Test Serialization",
             description="Testing serialization of events",
-            start=CalendarEventTime(dateTime=datetime.now().isoformat()),
-            end=CalendarEventTime(dateTime=datetime.now().replace(hour=datetime.now().hour+1).isoformat()),
+            start=CalendarEventTime(dateTime=now.isoformat()),
+            end=CalendarEventTime(dateTime=(now + timedelta(hours=1)).isoformat()),
             calendar_id="test-calendar"
         )
         
-        # Serialize to JSON
-        event_json = json.dumps(original_event.model_dump())
-        
-        # Deserialize from JSON
-        event_dict = json.loads(event_json)
-        deserialized_event = CalendarEvent.model_validate(event_dict)
+        # Serialize to JSON and deserialize it again, both in pydantic-core
+        deserialized_event = CalendarEvent.model_validate_json(original_event.model_dump_json())
 
         # Verify the event was preserved
         self.assertEqual(deserialized_event.id, original_event.id)
@@ -168,13 +174,14 @@ class TestModels(unittest.TestCase):
     
     def test_database_conversion(self):
         """Test conversion to and from database format."""
+        now = datetime.now()
         # Create a test event
         event = CalendarEvent(
             id="db-test-123",
             summary="Database Test",
             description="Testing database conversion",
-            start=CalendarEventTime(dateTime=datetime.now().isoformat()),
-            end=CalendarEventTime(dateTime=datetime.now().replace(hour=datetime.now().hour+1).isoformat()),
+            start=CalendarEventTime(dateTime=now.isoformat()),
+            end=CalendarEventTime(dateTime=(now + timedelta(hours=1)).isoformat()),
             calendar_id="test-db-calendar",
             project_id=5,
             project_name="Test Project"
@@ -1,17 +1,19 @@
 #!/usr/bin/env python3
 import database
+from sqlalchemy import select
 from models import CalendarEvent, CalendarEventTime
 from datetime import datetime, timedelta
 import json
 
 # Create a completely new event
-timestamp = datetime.now().isoformat()
+now = datetime.now()
+timestamp = now.isoformat()
 event = CalendarEvent(
     id=f"new_event_{timestamp}",
     summary=f"Brand New Event {timestamp[:10]}",
     description=f"A brand new event created at {timestamp}",
-    start=CalendarEventTime(dateTime=(datetime.now() + timedelta(days=1)).isoformat()),
-    end=CalendarEventTime(dateTime=(datetime.now() + timedelta(days=1, hours=1)).isoformat()),
+    start=CalendarEventTime(dateTime=(now + timedelta(days=1)).isoformat()),
+    end=CalendarEventTime(dateTime=(now + timedelta(days=1, hours=1)).isoformat()),
     calendar_id="primary"
 )
 
@@ -26,9 +28,9 @@ print(f"Added {added} events")
 
 # Retrieve the event from the database
 db = database.get_db_session()
-db_event = db.query(database.EventModel).filter(
+db_event = db.execute(select(database.EventModel).where(
     database.EventModel.event_id == event.id
-).first()
+)).scalar_one_or_none()
 
 if db_event:
     print(f"Retrieved event title: {db_event.title}")
@@ -39,4 +41,6 @@ if db_event:
     print(f"Pydantic event summary: {pydantic_event.summary}")
     print(f"Pydantic event start_dt: {pydantic_event.start_dt}")
 else:
-    print("Failed to retrieve the new event") 
\ No newline at end of file
+    print("Failed to retrieve the new event") 
+
+db.close()
@@ -4,12 +4,13 @@ from models import CalendarEvent, CalendarEventTime
 from datetime import datetime
 
 # Create a Pydantic model directly
+now = datetime.now().isoformat()
 event = CalendarEvent(
     id="test456",
     summary="Test Pydantic Event",
     description="An event created as a Pydantic model",
-    start=CalendarEventTime(dateTime=datetime.now().isoformat()),
-    end=CalendarEventTime(dateTime=datetime.now().isoformat()),
+    start=CalendarEventTime(dateTime=now),
+    end=CalendarEventTime(dateTime=now),
     calendar_id="primary"
 )
 
@@ -23,6 +24,7 @@ events = db.query(database.EventModel).all()
 print(f"Found {len(events)} events:")
 for event in events:
     print(f"Event: {event.title}, Start: {event.start_time}, ID: {event.event_id}")
+db.close()
 
 # Check unclassified events
 unclassified = database.get_unclassified_events()
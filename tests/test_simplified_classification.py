@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the keyword shortcut in the simplified classification module.
+"""
+
+import os
+import sys
+import unittest
+
+# Add the parent directory to the path so we can import modules from there
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simplified_classification
+from simplified_classification import KEYWORD_MATCH_CONFIDENCE, _keyword_match
+
+PROJECTS = [
+    (1, "Family", "Family events and responsibilities"),
+    (2, "Health", "Healthcare appointments and fitness"),
+    (3, "Learning", "Educational activities and courses"),
+    (4, "Personal", "Personal tasks and appointments"),
+    (5, "Work", "Work-related activities and meetings")
+]
+PROJECT_NAMES = [name for _, name, _ in PROJECTS]
+
+
+class FakeClassifier:
+    """Classifier stand-in that records the titles it is asked about."""
+    
+    def __init__(self):
+        self.titles = []
+    
+    def __call__(self, event_title, **kwargs):
+        self.titles.append(event_title)
+        return {'project': 'Health', 'confidence': 75.0, 'reason': 'fake'}
+
+
+class TestKeywordMatch(unittest.TestCase):
+    """Test which titles skip the classifier."""
+    
+    def test_whole_title_matches(self):
+        """A title that is just the project name matches, ignoring case and punctuation."""
+        self.assertEqual(_keyword_match("Work", PROJECT_NAMES), "Work")
+        self.assertEqual(_keyword_match("  family! ", PROJECT_NAMES), "Family")
+    
+    def test_name_inside_title_does_not_match(self):
+        """Titles that merely contain a project name are left to the classifier."""
+        for title in ["Personal trainer at the gym",
+                      "Work from home: dentist",
+                      "Learning to say no - therapy",
+                      ""]:
+            self.assertIsNone(_keyword_match(title, PROJECT_NAMES), title)
+    
+    def test_classify_event_uses_classifier_for_partial_matches(self):
+        """classify_event sends partial matches to the classifier and never reports keyword matches as certain."""
+        classifier = FakeClassifier()
+        title = "Personal trainer at the gym (keyword test)"
+        result = simplified_classification.classify_event(title, "", "", classifier=classifier, projects=PROJECTS)
+        self.assertEqual(classifier.titles, [title])
+        self.assertEqual(result['project_name'], "Health")
+        
+        result = simplified_classification.classify_event("work", "", "", classifier=classifier, projects=PROJECTS)
+        self.assertEqual(result['project_id'], 5)
+        self.assertLess(result['confidence'], 100)
+        self.assertEqual(result['confidence'], KEYWORD_MATCH_CONFIDENCE)
+
+
+if __name__ == "__main__":
+    unittest.main()
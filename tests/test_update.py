@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import database
+from sqlalchemy import select
 
 # Get the first unclassified event
 unclassified = database.get_unclassified_events(limit=1)
@@ -15,9 +16,9 @@ if unclassified:
         
         # Get the database ID for the event
         db = database.get_db_session()
-        db_event = db.query(database.EventModel).filter(
+        db_event = db.execute(select(database.EventModel).where(
             database.EventModel.event_id == event.id
-        ).first()
+        )).scalar_one_or_none()
         
         if db_event:
             print(f"Database event ID: {db_event.id}")
@@ -34,6 +35,7 @@ if unclassified:
                 print("No classified events found")
         else:
             print("Database event not found")
+        db.close()
     else:
         print("No projects found")
 else:
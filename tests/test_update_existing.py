@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import database
+from sqlalchemy import select
 from models import CalendarEvent, CalendarEventTime
 from datetime import datetime, timedelta
 import json
@@ -35,7 +36,7 @@ if existing:
         "end_time": event.end_dt.isoformat() if event.end_dt else "",
         "calendar_id": event.calendar_id or "",
         "project_id": event.project_id,
-        "raw_event_data": json.dumps(event.model_dump(), cls=database.DateTimeEncoder)
+        "raw_event_data": event.model_dump_json()
     }
     
     print(f"Model dict title: {model_dict['title']}")
@@ -45,9 +46,9 @@ if existing:
     print(f"Updated {added} events")
     
     # Check that it was updated
-    updated = db.query(database.EventModel).filter(
+    updated = db.execute(select(database.EventModel).where(
         database.EventModel.event_id == existing.event_id
-    ).first()
+    )).scalar_one_or_none()
     
     print(f"Updated event title: {updated.title}")
     print(f"Updated event description: {updated.description[:50]}...")
@@ -60,4 +61,6 @@ if existing:
         pydantic_event = updated.to_pydantic()
         print(f"Pydantic event summary: {pydantic_event.summary}")
 else:
-    print("No existing events found") 
\ No newline at end of file
+    print("No existing events found") 
+
+db.close()
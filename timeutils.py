@@ -2,6 +2,11 @@ from datetime import datetime
 from enum import Enum
 import json
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, fall back to the stdlib encoder
+    orjson = None
+
 class TimeOfDay(str, Enum):
     """Time of day categorization."""
     MORNING = "morning"
@@ -10,6 +15,15 @@ class TimeOfDay(str, Enum):
     UNKNOWN = "unknown"
 
 
+# Time of day for each hour 0-23: morning 5-11, afternoon 12-16, evening otherwise
+_TIME_OF_DAY_BY_HOUR = (
+    (TimeOfDay.EVENING,) * 5
+    + (TimeOfDay.MORNING,) * 7
+    + (TimeOfDay.AFTERNOON,) * 5
+    + (TimeOfDay.EVENING,) * 7
+)
+
+
 def get_time_of_day(dt: datetime) -> TimeOfDay:
     """
     Get time of day category based on hour.
@@ -22,14 +36,7 @@ def get_time_of_day(dt: datetime) -> TimeOfDay:
     """
     if not dt:
         return TimeOfDay.UNKNOWN
-        
-    hour = dt.hour
-    if 5 <= hour < 12:
-        return TimeOfDay.MORNING
-    elif 12 <= hour < 17:
-        return TimeOfDay.AFTERNOON
-    else:
-        return TimeOfDay.EVENING
+    return _TIME_OF_DAY_BY_HOUR[dt.hour]
 
 
 # Custom JSON encoder for datetime objects
@@ -41,4 +48,20 @@ class DateTimeEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+def json_dumps(obj) -> str:
+    """
+    Serialize obj to a JSON string, writing datetimes in ISO format.
+    
+    Uses orjson when installed, which serializes datetimes and enums natively,
+    and DateTimeEncoder otherwise.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, cls=DateTimeEncoder)
+
 
+def json_loads(data):
+    """Parse a JSON string or bytes, with orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)